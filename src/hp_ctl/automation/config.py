@@ -4,10 +4,20 @@
 """Configuration validation for automation module."""
 
 import logging
+import re
+from bisect import bisect_right
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# HH:MM (hour 0-23, minute 0-59), same leniency as strptime's "%H:%M"
+_TIME_RE = re.compile(r"([01]?\d|2[0-3]):([0-5]?\d)")
+
+
+def _is_valid_time(value: Any) -> bool:
+    """Check whether a config value is a valid HH:MM time string."""
+    return isinstance(value, str) and _TIME_RE.fullmatch(value) is not None
+
 
 def validate_automation_config(config: dict[str, Any]) -> None:
     """Validate automation configuration section.
@@ -86,14 +96,7 @@ def validate_automation_config(config: dict[str, Any]) -> None:
         # Simple format check (HH:MM)
         for key in ["start", "end"]:
             time_str = period[key]
-            try:
-                parts = time_str.split(":")
-                if len(parts) != 2:
-                    raise ValueError()
-                h, m = int(parts[0]), int(parts[1])
-                if not (0 <= h <= 23 and 0 <= m <= 59):
-                    raise ValueError()
-            except (ValueError, IndexError):
+            if not _is_valid_time(time_str):
                 raise ValueError(f"Invalid time format in night_off_period.{key}: {time_str}")
 
     # Validate ramping
@@ -112,12 +115,7 @@ def validate_automation_config(config: dict[str, Any]) -> None:
                 raise ValueError("DHW requires 'start_time' and 'target_temp'")
             # Time format check
             time_str = dhw["start_time"]
-            try:
-                parts = time_str.split(":")
-                h, m = int(parts[0]), int(parts[1])
-                if not (0 <= h <= 23 and 0 <= m <= 59):
-                    raise ValueError()
-            except (ValueError, IndexError):
+            if not _is_valid_time(time_str):
                 raise ValueError(f"Invalid DHW start_time: {time_str}")
 
     # Validate storage section
@@ -154,18 +152,14 @@ def get_heat_demand_for_temp(heat_demand_map: list[dict[str, float]], outdoor_te
     if outdoor_temp >= heat_demand_map[-1]["outdoor_temp"]:
         return heat_demand_map[-1]["daily_kwh"]
 
-    # Linear interpolation
-    for i in range(len(heat_demand_map) - 1):
-        lower = heat_demand_map[i]
-        upper = heat_demand_map[i + 1]
-
-        if lower["outdoor_temp"] <= outdoor_temp <= upper["outdoor_temp"]:
-            # Interpolate
-            temp_range = upper["outdoor_temp"] - lower["outdoor_temp"]
-            kwh_range = upper["daily_kwh"] - lower["daily_kwh"]
-            temp_offset = outdoor_temp - lower["outdoor_temp"]
+    # Binary search for the segment [lower, upper) containing the temperature
+    i = bisect_right(heat_demand_map, outdoor_temp, key=lambda entry: entry["outdoor_temp"])
+    lower = heat_demand_map[i - 1]
+    upper = heat_demand_map[i]
 
-            return lower["daily_kwh"] + (temp_offset / temp_range) * kwh_range
+    # Linear interpolation
+    temp_range = upper["outdoor_temp"] - lower["outdoor_temp"]
+    kwh_range = upper["daily_kwh"] - lower["daily_kwh"]
+    temp_offset = outdoor_temp - lower["outdoor_temp"]
 
-    # Should never reach here if map is valid
-    return heat_demand_map[-1]["daily_kwh"]
+    return lower["daily_kwh"] + (temp_offset / temp_range) * kwh_range
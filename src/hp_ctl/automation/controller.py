@@ -4,7 +4,8 @@
 """Main automation controller orchestrating weather, storage, and energy tracking."""
 
 import logging
-from copy import deepcopy
+from collections import defaultdict, deque
+from copy import copy
 from datetime import datetime, timedelta
 from threading import Event, Thread
 from typing import Any, Callable, Optional
@@ -20,6 +21,31 @@ from hp_ctl.mqtt import MqttClient
 logger = logging.getLogger(__name__)
 
 
+def _parse_three_way_valve(payload: str) -> str:
+    """Parse valve state from combined string: "Valve:Room, Defrost:Inactive"."""
+    if "Valve:DHW" in payload:
+        return "DHW"
+    if "Valve:Room" in payload:
+        return "Room"
+    return "Unknown"
+
+
+# Heat pump state fields collected into snapshots, with their payload parsers
+STATE_FIELD_PARSERS: dict[str, Callable[[str], Any]] = {
+    "outdoor_temp": float,
+    "heat_power_generation": float,
+    "heat_power_consumption": float,
+    "inlet_water_temp": float,
+    "outlet_water_temp": float,
+    "zone1_actual_temp": float,
+    "three_way_valve": _parse_three_way_valve,
+    "hp_status": str,
+    "operating_mode": str,
+    "zone1_heat_target_temp": float,
+    "dhw_target_temp": float,
+}
+
+
 class AutomationController:
     """Main controller for automation features."""
 
@@ -29,6 +55,7 @@ class AutomationController:
         mqtt_client: MqttClient,
         ha_mapper: HomeAssistantMapper,
         command_callback: Optional[Callable[[dict[str, Any]], None]] = None,
+        clock: Callable[[], datetime] = datetime.now,
     ) -> None:
         """Initialize automation controller.
 
@@ -40,6 +67,7 @@ class AutomationController:
             mqtt_client: MQTT client instance (shared with main app).
             ha_mapper: Home Assistant mapper for discovery.
             command_callback: Callback to send commands back to heat pump.
+            clock: Returns the current local time. Defaults to datetime.now.
         """
         # Validate config
         validate_automation_config(config)
@@ -49,6 +77,9 @@ class AutomationController:
         self.ha_mapper = ha_mapper
         self.device_id = ha_mapper.device_id
         self.command_callback = command_callback
+        self._clock = clock
+        # Format: hp_ctl/{device_id}/state/{field_name}
+        self._state_topic_prefix = f"{ha_mapper.topic_prefix}/{self.device_id}/state/"
 
         # Initialize discovery helper for automation entities
         self.discovery = AutomationDiscovery(
@@ -76,13 +107,14 @@ class AutomationController:
             longitude=weather_config["longitude"],
             on_data=self._on_weather_data,
             on_error=self._on_weather_error,
+            on_stale=self._on_weather_stale,
         )
 
         # Heat demand mapping
         self.heat_demand_map = config["heat_demand_map"]
 
         # Track current state
-        self.current_snapshot = HeatPumpSnapshot(timestamp=datetime.now())
+        self.current_snapshot = HeatPumpSnapshot(timestamp=self._clock())
         self.last_inserted_snapshot: Optional[HeatPumpSnapshot] = None
         self.last_weather_update: Optional[datetime] = None
         self.last_cleanup: Optional[datetime] = None
@@ -106,7 +138,8 @@ class AutomationController:
 
         # EEPROM protection: track command history per parameter
         # Limits write frequency to prevent EEPROM wear
-        self.change_history: dict[str, list[datetime]] = {}
+        # Oldest first, so expired entries are popped from the left
+        self.change_history: defaultdict[str, deque[datetime]] = defaultdict(deque)
         self.max_changes_per_hour = 15
 
         logger.info(
@@ -127,19 +160,7 @@ class AutomationController:
         )
 
         # Subscribe to heat pump state topics (for data collection)
-        state_topics = [
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/outdoor_temp",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/heat_power_generation",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/heat_power_consumption",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/inlet_water_temp",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/outlet_water_temp",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/zone1_actual_temp",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/three_way_valve",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/hp_status",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/operating_mode",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/zone1_heat_target_temp",
-            f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/dhw_target_temp",
-        ]
+        state_topics = [self._state_topic_prefix + name for name in STATE_FIELD_PARSERS]
 
         for topic in state_topics:
             self.mqtt_client.subscribe(topic)
@@ -195,7 +216,7 @@ class AutomationController:
         """Handle incoming MQTT messages."""
         if topic.endswith("/automation/mode/set"):
             self._on_automation_mode_command(topic, payload)
-        elif f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/" in topic:
+        elif self._state_topic_prefix in topic:
             self._on_mqtt_state_message(topic, payload)
 
     def _on_automation_mode_command(self, topic: str, payload: str) -> None:
@@ -227,51 +248,25 @@ class AutomationController:
             return  # Don't process messages while paused
 
         # Extract field name from topic
-        # Format: hp_ctl/{device_id}/state/{field_name}
-        if not topic.startswith(f"{self.ha_mapper.topic_prefix}/{self.device_id}/state/"):
+        if not topic.startswith(self._state_topic_prefix):
             return
 
-        field_name = topic.split("/")[-1]
+        field_name = topic[len(self._state_topic_prefix) :]
+        parse = STATE_FIELD_PARSERS.get(field_name)
 
         try:
             # Update current snapshot based on field
-            if field_name == "outdoor_temp":
-                self.current_snapshot.outdoor_temp = float(payload)
-            elif field_name == "heat_power_generation":
-                self.current_snapshot.heat_power_generation = float(payload)
-            elif field_name == "heat_power_consumption":
-                self.current_snapshot.heat_power_consumption = float(payload)
-            elif field_name == "inlet_water_temp":
-                self.current_snapshot.inlet_water_temp = float(payload)
-            elif field_name == "outlet_water_temp":
-                self.current_snapshot.outlet_water_temp = float(payload)
-            elif field_name == "zone1_actual_temp":
-                self.current_snapshot.zone1_actual_temp = float(payload)
-            elif field_name == "three_way_valve":
-                # Parse valve state from combined string: "Valve:Room, Defrost:Inactive"
-                if "Valve:DHW" in payload:
-                    self.current_snapshot.three_way_valve = "DHW"
-                elif "Valve:Room" in payload:
-                    self.current_snapshot.three_way_valve = "Room"
-                else:
-                    self.current_snapshot.three_way_valve = "Unknown"
-            elif field_name == "hp_status":
-                self.current_snapshot.hp_status = payload
-            elif field_name == "operating_mode":
-                self.current_snapshot.operating_mode = payload
-            elif field_name == "zone1_heat_target_temp":
-                self.current_snapshot.zone1_heat_target_temp = float(payload)
-            elif field_name == "dhw_target_temp":
-                self.current_snapshot.dhw_target_temp = float(payload)
+            if parse is not None:
+                setattr(self.current_snapshot, field_name, parse(payload))
 
             # Update timestamp
-            self.current_snapshot.timestamp = datetime.now()
+            self.current_snapshot.timestamp = self._clock()
 
             # Store snapshot to database only if data has changed
             if self._snapshot_has_changed():
                 self.storage.insert_snapshot(self.current_snapshot)
-                # Deep copy to avoid reference issues
-                self.last_inserted_snapshot = deepcopy(self.current_snapshot)
+                # Copy to avoid reference issues; all fields are immutable values
+                self.last_inserted_snapshot = copy(self.current_snapshot)
                 # Invalidate daily summary cache since we inserted new data
                 self._cached_daily_summary = None
                 logger.debug("Snapshot inserted (data changed)")
@@ -303,10 +298,10 @@ class AutomationController:
         self.current_snapshot.outdoor_temp = weather_data.outdoor_temp_forecast_24h
         self.last_weather_update = weather_data.timestamp
 
-        # Clear error state if we were paused
+        # Clear error state if we were paused or serving stale data
+        self.last_error = None
         if self.automation_paused:
             self.automation_paused = False
-            self.last_error = None
             logger.info("Automation resumed after weather API recovery")
 
         # Publish weather data to MQTT
@@ -367,9 +362,26 @@ class AutomationController:
         # Publish updated status
         self._publish_status()
 
+    def _on_weather_stale(self, error_msg: str) -> None:
+        """Callback when a weather fetch fails but recent data is still in use.
+
+        Unlike _on_weather_error, automation keeps running on the stale forecast.
+
+        Args:
+            error_msg: Error message description.
+        """
+        self.last_error = error_msg
+
+        # Publish error to MQTT without pausing automation
+        error_topic = f"{self.device_id}/automation/error"
+        self.mqtt_client.publish(error_topic, error_msg)
+
+        # Publish updated status
+        self._publish_status()
+
     def _maybe_cleanup_old_data(self) -> None:
         """Perform periodic cleanup of old data (once per day)."""
-        now = datetime.now()
+        now = self._clock()
 
         # Check if we've cleaned up today
         if self.last_cleanup is not None:
@@ -379,7 +391,7 @@ class AutomationController:
 
         # Perform cleanup
         logger.info("Running database cleanup (retention: %d days)", self.retention_days)
-        deleted = self.storage.cleanup_old_data(self.retention_days)
+        deleted = self.storage.cleanup_old_data(self.retention_days, now=now)
         self.last_cleanup = now
 
         logger.info("Cleanup complete: deleted %d old records", deleted)
@@ -423,7 +435,7 @@ class AutomationController:
         Returns:
             DailySummary instance or None if no data available.
         """
-        today = datetime.now()
+        today = self._clock()
         today_str = today.date().isoformat()
 
         # Check if we need to recalculate
@@ -454,17 +466,15 @@ class AutomationController:
         Returns:
             True if command can be sent, False if limit exceeded.
         """
-        now = datetime.now()
+        now = self._clock()
         one_hour_ago = now - timedelta(hours=1)
 
         # Get change history for this parameter
-        if param_name not in self.change_history:
-            self.change_history[param_name] = []
-
         history = self.change_history[param_name]
 
         # Remove changes older than 1 hour (rolling window)
-        history[:] = [ts for ts in history if ts > one_hour_ago]
+        while history and history[0] <= one_hour_ago:
+            history.popleft()
 
         # Check if we've hit the limit
         if len(history) >= self.max_changes_per_hour:
@@ -483,9 +493,7 @@ class AutomationController:
         Args:
             param_name: Name of parameter that was changed.
         """
-        now = datetime.now()
-        if param_name not in self.change_history:
-            self.change_history[param_name] = []
+        now = self._clock()
         self.change_history[param_name].append(now)
         logger.debug(
             "EEPROM protection: recorded %s change (%d in last hour)",
@@ -534,7 +542,7 @@ class AutomationController:
     def _run_control_logic(self) -> None:
         """Execute the heating algorithm and send commands."""
         # 1. Gather inputs
-        now = datetime.now()
+        now = self._clock()
         summary = self._get_cached_daily_summary()
         actual_heat = summary.total_heat_kwh if summary else 0.0
 
@@ -770,7 +778,7 @@ class AutomationController:
         """
         if date is None:
             # Default to yesterday (complete day)
-            date = datetime.now() - timedelta(days=1)
+            date = self._clock() - timedelta(days=1)
 
         summary = self.storage.get_daily_summary(date)
         if summary is None:
@@ -8,13 +8,16 @@ import sqlite3
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
 # Current schema version
 SCHEMA_VERSION = 2
 
+# Special SQLite path for a database that lives only as long as its connection
+IN_MEMORY_DB = ":memory:"
+
 # Database schema - applied directly without migrations for fresh installs
 SCHEMA_SQL = """
     CREATE TABLE IF NOT EXISTS snapshots (
@@ -39,7 +42,7 @@ SCHEMA_SQL = """
 """
 
 
-@dataclass
+@dataclass(slots=True)
 class HeatPumpSnapshot:
     """Represents a single heat pump data snapshot."""
 
@@ -58,6 +61,33 @@ class HeatPumpSnapshot:
     three_way_valve: Optional[str] = None
 
 
+INSERT_SNAPSHOT_SQL = """
+    INSERT OR REPLACE INTO snapshots (
+        timestamp, outdoor_temp, heat_power_generation, heat_power_consumption,
+        inlet_water_temp, outlet_water_temp,
+        zone1_actual_temp, dhw_target_temp, zone1_heat_target_temp,
+        hp_status, operating_mode
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _snapshot_row(snapshot: HeatPumpSnapshot) -> tuple:
+    """Convert a snapshot into INSERT_SNAPSHOT_SQL parameters."""
+    return (
+        snapshot.timestamp.isoformat(),
+        snapshot.outdoor_temp,
+        snapshot.heat_power_generation,
+        snapshot.heat_power_consumption,
+        snapshot.inlet_water_temp,
+        snapshot.outlet_water_temp,
+        snapshot.zone1_actual_temp,
+        snapshot.dhw_target_temp,
+        snapshot.zone1_heat_target_temp,
+        snapshot.hp_status,
+        snapshot.operating_mode,
+    )
+
+
 @dataclass
 class DailySummary:
     """Daily aggregated statistics."""
@@ -77,10 +107,12 @@ class AutomationStorage:
         """Initialize storage with database path.
 
         Args:
-            db_path: Path to SQLite database file.
+            db_path: Path to SQLite database file, or ":memory:" for a
+                transient in-memory database.
         """
         self.db_path = Path(db_path)
-        self._ensure_db_directory()
+        if db_path != IN_MEMORY_DB:
+            self._ensure_db_directory()
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
         self._initialize_schema()
@@ -151,32 +183,21 @@ class AutomationStorage:
             snapshot: HeatPumpSnapshot instance to store.
         """
         cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            INSERT OR REPLACE INTO snapshots (
-                timestamp, outdoor_temp, heat_power_generation, heat_power_consumption,
-                inlet_water_temp, outlet_water_temp,
-                zone1_actual_temp, dhw_target_temp, zone1_heat_target_temp,
-                hp_status, operating_mode
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                snapshot.timestamp.isoformat(),
-                snapshot.outdoor_temp,
-                snapshot.heat_power_generation,
-                snapshot.heat_power_consumption,
-                snapshot.inlet_water_temp,
-                snapshot.outlet_water_temp,
-                snapshot.zone1_actual_temp,
-                snapshot.dhw_target_temp,
-                snapshot.zone1_heat_target_temp,
-                snapshot.hp_status,
-                snapshot.operating_mode,
-            ),
-        )
+        cursor.execute(INSERT_SNAPSHOT_SQL, _snapshot_row(snapshot))
         self.conn.commit()
         logger.debug("Inserted snapshot at %s", snapshot.timestamp)
 
+    def insert_snapshots(self, snapshots: Iterable[HeatPumpSnapshot]) -> None:
+        """Insert several heat pump snapshots in a single transaction.
+
+        Args:
+            snapshots: HeatPumpSnapshot instances to store.
+        """
+        rows = [_snapshot_row(snapshot) for snapshot in snapshots]
+        with self.conn:
+            self.conn.executemany(INSERT_SNAPSHOT_SQL, rows)
+        logger.debug("Inserted %d snapshots", len(rows))
+
     def get_snapshots(self, start_date: datetime, end_date: datetime) -> list[HeatPumpSnapshot]:
         """Retrieve snapshots within a date range.
 
@@ -286,16 +307,19 @@ class AutomationStorage:
             runtime_hours=runtime_seconds / 3600,
         )
 
-    def cleanup_old_data(self, retention_days: int) -> int:
+    def cleanup_old_data(self, retention_days: int, now: Optional[datetime] = None) -> int:
         """Delete snapshots older than retention period.
 
         Args:
             retention_days: Number of days to keep.
+            now: Reference time for the retention period. Defaults to datetime.now().
 
         Returns:
             Number of rows deleted.
         """
-        cutoff = datetime.now() - timedelta(days=retention_days)
+        if now is None:
+            now = datetime.now()
+        cutoff = now - timedelta(days=retention_days)
         cursor = self.conn.cursor()
         cursor.execute(
             "DELETE FROM snapshots WHERE timestamp < ?",
@@ -4,6 +4,7 @@
 """Weather API client using Open-Meteo service for forecast data."""
 
 import logging
+import random
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from threading import Event, Thread
@@ -16,6 +17,12 @@ logger = logging.getLogger(__name__)
 # Open-Meteo API endpoint
 OPEN_METEO_API = "https://api.open-meteo.com/v1/forecast"
 
+# Last-good data younger than this is kept in use when a fetch fails (covers one missed day)
+MAX_STALE_AGE = timedelta(hours=36)
+
+# Back-off before refetching after a failed fetch
+RETRY_INTERVAL = timedelta(minutes=5)
+
 
 @dataclass
 class WeatherData:
@@ -36,21 +43,30 @@ class WeatherAPIClient:
         longitude: float,
         on_data: Optional[Callable[[WeatherData], None]] = None,
         on_error: Optional[Callable[[str], None]] = None,
+        on_stale: Optional[Callable[[str], None]] = None,
+        fetch_jitter: float = 60.0,
     ) -> None:
         """Initialize weather API client.
 
-        Fetches 24h average temperature on startup and at midnight (00:00) daily.
+        Fetches 24h average temperature on startup and daily shortly after midnight
+        (00:00 plus a random delay of up to fetch_jitter seconds).
 
         Args:
             latitude: Location latitude.
             longitude: Location longitude.
             on_data: Callback invoked when new weather data is received.
             on_error: Callback invoked when API error occurs.
+            on_stale: Callback invoked when a fetch fails but recent data is kept
+                in use.
+            fetch_jitter: Maximum random delay in seconds added after midnight, so
+                clients do not all hit the API at 00:00:00. Defaults to 60.
         """
         self.latitude = latitude
         self.longitude = longitude
+        self.fetch_jitter = fetch_jitter
         self.on_data_callback = on_data
         self.on_error_callback = on_error
+        self.on_stale_callback = on_stale
 
         self._thread: Optional[Thread] = None
         self._stop_event = Event()
@@ -63,7 +79,7 @@ class WeatherAPIClient:
             return
 
         logger.info(
-            "Starting weather client (lat=%.2f, lon=%.2f, fetches at midnight)",
+            "Starting weather client (lat=%.2f, lon=%.2f, fetches after midnight + jitter)",
             self.latitude,
             self.longitude,
         )
@@ -93,23 +109,31 @@ class WeatherAPIClient:
     def _fetch_loop(self) -> None:
         """Background thread loop for periodic weather fetching.
 
-        Fetches immediately on startup, then schedules next fetch for midnight (00:00).
+        Fetches immediately on startup, then schedules next fetch shortly after
+        midnight (00:00 plus a random delay of up to fetch_jitter seconds).
+        After a failed fetch, the fetch is retried every RETRY_INTERVAL until it succeeds.
         """
         # Fetch immediately on startup
-        self._update_and_notify("startup")
+        failed = self._update_and_notify("startup")
 
-        # Continue fetching at midnight each day
+        # Continue fetching after midnight (plus jitter) each day
         while not self._stop_event.is_set():
-            s_to_midnight = self._get_s_to_midnight()
-
-            logger.debug("Next weather fetch in %.1f hours (at midnight)", s_to_midnight / 3600)
+            if failed:
+                s_to_fetch = RETRY_INTERVAL.total_seconds()
+                reason = "retry"
+                logger.debug("Retrying weather fetch in %.0f minutes", s_to_fetch / 60)
+            else:
+                s_to_fetch = self._get_s_to_midnight() + random.uniform(0, self.fetch_jitter)
+                reason = "scheduled"
+                logger.debug(
+                    "Next weather fetch in %.1f hours (after midnight + jitter)", s_to_fetch / 3600
+                )
 
-            # Wait until midnight (or stop event)
-            if self._stop_event.wait(timeout=s_to_midnight):
+            # Wait until the next fetch (or stop event)
+            if self._stop_event.wait(timeout=s_to_fetch):
                 break  # Stop event was set
 
-            # Fetch at midnight
-            self._update_and_notify("scheduled")
+            failed = self._update_and_notify(reason)
 
     def _get_s_to_midnight(self) -> float:
         """Calculate seconds until next midnight (00:00)."""
@@ -117,8 +141,15 @@ class WeatherAPIClient:
         tomorrow = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
         return (tomorrow - now).total_seconds()
 
-    def _update_and_notify(self, reason: str) -> None:
-        """Fetch weather data and notify callbacks."""
+    def _update_and_notify(self, reason: str) -> bool:
+        """Fetch weather data and notify callbacks.
+
+        Args:
+            reason: Why the fetch happens, used in log and error messages.
+
+        Returns:
+            True if the fetch failed and should be retried soon, False otherwise.
+        """
         try:
             weather_data = self._fetch_weather()
 
@@ -137,16 +168,28 @@ class WeatherAPIClient:
 
         except Exception as e:  # pylint: disable=broad-except
             error_msg = f"Failed to fetch weather ({reason}): {e}"
+
+            # Keep serving recent data through transient API outages
+            last = self._last_data
+            if last is not None and datetime.now() - last.timestamp < MAX_STALE_AGE:
+                logger.warning("%s; using stale forecast for %s", error_msg, last.date)
+                if self.on_stale_callback:
+                    self.on_stale_callback(error_msg)
+                return True
+
             logger.exception(error_msg)
 
             # Invoke error callback
             if self.on_error_callback:
                 self.on_error_callback(error_msg)
+            return True
+
+        return False
 
     def _fetch_weather(self) -> Optional[WeatherData]:
         """Fetch forecasted 24-hour average temperature for today from Open-Meteo API.
 
-        Called at midnight, so "today" represents the next 24 hours.
+        Called shortly after midnight, so "today" represents the next 24 hours.
 
         Returns:
             WeatherData instance with today's 24h forecast temp, or None on failure.
@@ -175,7 +218,7 @@ class WeatherAPIClient:
             logger.warning("Insufficient temperature data available")
             return None
 
-        # forecast_days=1 returns [today] - at midnight this is the next 24 hours
+        # forecast_days=1 returns [today] - just after midnight this is the next 24 hours
         outdoor_temp_forecast = float(temp_values[0])
         today_str = data["daily"]["time"][0]
 
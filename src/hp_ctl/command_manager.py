@@ -12,7 +12,7 @@ Implements HeishaMon's sequential locking pattern:
 import logging
 import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +20,16 @@ logger = logging.getLogger(__name__)
 QUERY_INTERVAL = 15  # seconds between queries
 RESPONSE_TIMEOUT = 2.0  # seconds to wait for response
 
+# Panasonic query command (without checksum, which is added by the UART layer):
+# - Byte 0: 0x71 (query header, not 0xf1 for settings)
+# - Byte 1: 0x6c (length - 2 = 108)
+# - Byte 2: 0x01 (source)
+# - Byte 3: 0x10 (packet type)
+# - Bytes 4-109: 0x00 (all parameters zero for query)
+QUERY_COMMAND = b"\x71\x6c\x01\x10" + bytes(106)
+# Extra query: same layout with packet type 0x21 (power stats)
+EXTRA_QUERY_COMMAND = b"\x71\x6c\x01\x21" + bytes(106)
+
 
 class CommandManager:
     """Manages all heat pump commands with sequential locking.
@@ -36,15 +46,20 @@ class CommandManager:
     - No startup delay (first query sent immediately)
     """
 
-    def __init__(self, uart_transceiver) -> None:
+    # Fixed 110-byte frames, shared by all instances
+    query_command = QUERY_COMMAND
+    extra_query_command = EXTRA_QUERY_COMMAND
+
+    def __init__(self, uart_transceiver, clock: Callable[[], float] = time.monotonic) -> None:
         """Initialize command manager.
 
         Args:
             uart_transceiver: UART transceiver instance for sending commands.
+            clock: Time source in seconds used for query intervals and response
+                timeouts. Defaults to time.monotonic.
         """
         self.uart = uart_transceiver
-        self.query_command = self._build_query_command()
-        self.extra_query_command = self._build_extra_query_command()
+        self._clock = clock
 
         # Command queue (FIFO for setting commands)
         self.command_queue: list[bytes] = []
@@ -67,46 +82,6 @@ class CommandManager:
             RESPONSE_TIMEOUT,
         )
 
-    def _build_query_command(self) -> bytes:
-        """Build the Panasonic query command (0x71 header).
-
-        Query format from protocol reference:
-        - Byte 0: 0x71 (query header, not 0xf1 for settings)
-        - Byte 1: 0x6c (length - 2 = 108)
-        - Byte 2: 0x01 (source)
-        - Byte 3: 0x10 (packet type)
-        - Bytes 4-109: 0x00 (all parameters zero for query)
-        - Byte 110: checksum (calculated and added by UART layer)
-
-        Returns:
-            110-byte query command (without checksum).
-        """
-        buffer = bytearray(110)
-        buffer[0] = 0x71  # Query header
-        buffer[1] = 0x6C  # Length - 2 (108)
-        buffer[2] = 0x01  # Source
-        buffer[3] = 0x10  # Packet type
-        # Rest is already 0x00 (query has no parameter changes)
-        return bytes(buffer)
-
-    def _build_extra_query_command(self) -> bytes:
-        """Build the Panasonic extra query command (0x71 header, 0x21 type).
-
-        Extra query format:
-        - Byte 0: 0x71 (query header)
-        - Byte 1: 0x6c (length - 2 = 108)
-        - Byte 2: 0x01 (source)
-        - Byte 3: 0x21 (packet type for power stats)
-        - Bytes 4-109: 0x00
-        - Byte 110: checksum (calculated and added by UART layer)
-
-        Returns:
-            110-byte query command (without checksum).
-        """
-        buffer = bytearray(self.query_command)
-        buffer[3] = 0x21  # Packet type 0x21 (Extra)
-        return bytes(buffer)
-
     def queue_command(self, encoded_bytes: bytes) -> None:
         """Queue a setting command (0xf1) to be sent.
 
@@ -163,7 +138,7 @@ class CommandManager:
         try:
             self.uart.send(command_bytes)
             with self._state_lock:
-                self.last_send_time = time.time()
+                self.last_send_time = self._clock()
                 if is_query:
                     self.last_query_time = self.last_send_time
                     self.waiting_for_response = True
@@ -181,7 +156,7 @@ class CommandManager:
         """Check if response timeout has occurred."""
         with self._state_lock:
             if self.waiting_for_response and self.last_send_time is not None:
-                elapsed = time.time() - self.last_send_time
+                elapsed = self._clock() - self.last_send_time
                 if elapsed >= RESPONSE_TIMEOUT:
                     logger.warning("Response timeout (%.1fs)", elapsed)
                     self.waiting_for_response = False
@@ -197,9 +172,53 @@ class CommandManager:
                 # First query - send immediately
                 return True
 
-            elapsed = time.time() - self.last_query_time
+            elapsed = self._clock() - self.last_query_time
             return elapsed >= QUERY_INTERVAL
 
+    def _tick(self) -> bool:
+        """Run one scheduling step: check the timeout and send the next due command.
+
+        Priority order: queued setting commands, pending extra query, periodic query.
+
+        Returns:
+            True if the next step should run without waiting, False otherwise.
+        """
+        # Check timeout first
+        self._check_timeout()
+
+        # Only process if not waiting for response
+        with self._state_lock:
+            if self.waiting_for_response:
+                return False
+
+        # Priority 1: Process queued setting commands
+        command_to_send = None
+        with self._queue_lock:
+            if self.command_queue:
+                command_to_send = self.command_queue.pop(0)
+
+        if command_to_send:
+            self._send_command(command_to_send, is_query=False)
+            return True
+
+        # Priority 2: Send extra query if pending (requested after standard query)
+        send_extra = False
+        with self._state_lock:
+            if self.pending_extra_query:
+                send_extra = True
+                self.pending_extra_query = False
+
+        if send_extra:
+            self._send_command(self.extra_query_command, is_query=True)
+            return True
+
+        # Priority 3: Send periodic query if interval elapsed
+        if self._should_send_query():
+            with self._state_lock:
+                self.pending_extra_query = True
+            self._send_command(self.query_command, is_query=True)
+        return False
+
     def _manager_loop(self) -> None:
         """Background loop: process command queue and send periodic queries.
 
@@ -212,42 +231,8 @@ class CommandManager:
 
         while not self._stop_event.is_set():
             try:
-                # Check timeout first
-                self._check_timeout()
-
-                # Only process if not waiting for response
-                can_send = False
-                with self._state_lock:
-                    can_send = not self.waiting_for_response
-
-                if can_send:
-                    # Priority 1: Process queued setting commands
-                    command_to_send = None
-                    with self._queue_lock:
-                        if self.command_queue:
-                            command_to_send = self.command_queue.pop(0)
-
-                    if command_to_send:
-                        self._send_command(command_to_send, is_query=False)
-                        continue  # Skip to next iteration
-
-                    # Priority 2: Send extra query if pending (requested after standard query)
-                    send_extra = False
-                    with self._state_lock:
-                        if self.pending_extra_query:
-                            send_extra = True
-                            self.pending_extra_query = False
-
-                    if send_extra:
-                        self._send_command(self.extra_query_command, is_query=True)
-                        continue
-
-                    # Priority 3: Send periodic query if interval elapsed
-                    if self._should_send_query():
-                        with self._state_lock:
-                            self.pending_extra_query = True
-                        self._send_command(self.query_command, is_query=True)
-
+                if self._tick():
+                    continue  # Skip to next iteration
             except Exception as e:
                 logger.exception("Error in command manager loop: %s", e)
 
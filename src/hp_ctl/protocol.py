@@ -2,6 +2,7 @@
 # SPDX-FileCopyrightText: Copyright (c) 2025 Jonas Remmert <j.remmert@mailbox.org>
 
 import logging
+import struct
 from dataclasses import dataclass
 from typing import Any, Callable, Optional
 
@@ -27,6 +28,19 @@ OPERATING_MODE_OPTIONS = [
 
 HP_STATUS_OPTIONS = ["Off", "On"]
 
+# Raw byte 4 values of a standard packet
+HP_STATUS_MAP = {
+    0x55: "Off",
+    0x56: "On",
+    0x96: "Force DHW",
+    0x65: "Service: Water pump",
+    0x75: "Service: Air purge",
+    0xF0: "Service: Pump down",
+}
+
+# Raw byte 4 value of a standard packet that carries no data
+NO_DATA_STATUS = 0x8A
+
 
 @dataclass
 class FieldSpec:
@@ -65,6 +79,12 @@ class MessageCodec:
     def __init__(self, fields: list[FieldSpec], user_limits: Optional[dict[str, Any]] = None):
         self.fields = fields
         self.user_limits = user_limits or {}
+        # Static per-field decode data: (field, end offset, skip_zero)
+        self._decode_plan = [
+            (field, field.byte_offset + (field.byte_length or 1), field.skip_zero)
+            for field in fields
+        ]
+        self._batch = _build_batch_unpacker(fields)
 
     def decode(self, raw_msg: bytes, packet_type: int) -> Message:
         """Decode a raw UART message into a Message object.
@@ -80,12 +100,12 @@ class MessageCodec:
             Decoded Message object
         """
         logger.debug("Decoding message: %d bytes, packet_type: 0x%02x", len(raw_msg), packet_type)
-        # Parse fields from data
-        values = {}
-        for field in self.fields:
+        # Parse fields from data; the values dict is built once at the end
+        decoded: list[tuple[FieldSpec, Any]] = []
+        raw_values = self._extract_values(raw_msg)
+        for (field, max_offset, skip_zero), raw_value in zip(self._decode_plan, raw_values):
             # Check if field fits in buffer
-            max_offset = field.byte_offset + (field.byte_length or 1)
-            if max_offset > len(raw_msg):
+            if raw_value is None:
                 logger.debug(
                     "Field %s: offset %d exceeds message length %d (skipping)",
                     field.name,
@@ -94,10 +114,8 @@ class MessageCodec:
                 )
                 continue
 
-            raw_value = self._extract_value(raw_msg, field)
-
             # Skip fields with 0x00 (no data available) if skip_zero is True
-            if raw_value == 0 and field.skip_zero:
+            if skip_zero and not raw_value:
                 logger.debug("Field %s: raw=0x0 (skipping - no data)", field.name)
                 continue
 
@@ -120,7 +138,7 @@ class MessageCodec:
                     )
                     continue
 
-            values[field.name] = converted_value
+            decoded.append((field, converted_value))
             logger.debug(
                 "Field %s: raw=0x%x, converted=%s %s",
                 field.name,
@@ -129,13 +147,14 @@ class MessageCodec:
                 field.unit or "",
             )
 
+        values = {field.name: value for field, value in decoded}
+
         # Log all converted values in a readable format if logger is at DEBUG level
         if logger.isEnabledFor(logging.DEBUG):
             lines = [f"{len(values)} fields:"]
-            for name, value in values.items():
-                unit = next((f.unit for f in self.fields if f.name == name), "") or ""
-                unit_str = f" {unit}" if unit else ""
-                lines.append(f"  {name:<30} {value}{unit_str}")
+            for field, value in decoded:
+                unit_str = f" {field.unit}" if field.unit else ""
+                lines.append(f"  {field.name:<30} {value}{unit_str}")
             logger.debug("\n".join(lines))
 
         logger.debug("Message decoded successfully: %d fields", len(values))
@@ -236,6 +255,17 @@ class MessageCodec:
             # Single byte field
             buffer[field.byte_offset] = raw_value & 0xFF
 
+    def _extract_values(self, data: bytes) -> list[Optional[int]]:
+        """Extract raw values for all fields, None for fields beyond the buffer."""
+        if self._batch is not None:
+            batch, offset = self._batch
+            if offset + batch.size <= len(data):
+                return list(batch.unpack_from(data, offset))
+        return [
+            self._extract_value(data, field) if max_offset <= len(data) else None
+            for field, max_offset, _ in self._decode_plan
+        ]
+
     def _extract_value(self, data: bytes, field: FieldSpec) -> int:
         """Extract a value from binary data using field specification."""
         if field.byte_length and field.byte_length > 1:
@@ -268,6 +298,25 @@ class MessageCodec:
         return byte_val
 
 
+def _build_batch_unpacker(fields: list[FieldSpec]) -> Optional[tuple[struct.Struct, int]]:
+    """Build a single unpacker if fields are contiguous 16-bit little-endian words.
+
+    Returns:
+        (Struct, start offset) for the whole run, or None if fields don't qualify.
+    """
+    if not fields:
+        return None
+    start = fields[0].byte_offset
+    for i, field in enumerate(fields):
+        if (
+            field.byte_length != 2
+            or field.bit_offset is not None
+            or field.byte_offset != start + 2 * i
+        ):
+            return None
+    return struct.Struct(f"<{len(fields)}H"), start
+
+
 def temp_converter(value: int) -> float:
     """Convert temperature: value - 128"""
     return value - 128
@@ -359,17 +408,9 @@ def hp_status_converter(value: int) -> str:
 
     Raises ValueError for invalid values (like 0x8a in no-data packets) to trigger filtering
     """
-    status_map = {
-        0x55: "Off",
-        0x56: "On",
-        0x96: "Force DHW",
-        0x65: "Service: Water pump",
-        0x75: "Service: Air purge",
-        0xF0: "Service: Pump down",
-    }
-    if value not in status_map:
+    if value not in HP_STATUS_MAP:
         raise ValueError(f"Invalid hp_status value: 0x{value:02x}")
-    return status_map[value]
+    return HP_STATUS_MAP[value]
 
 
 def hp_status_inverse_converter(value: str) -> int:
@@ -790,6 +831,8 @@ class HeatPumpProtocol:
     def __init__(self, user_limits: Optional[dict[str, Any]] = None):
         self.standard_codec = MessageCodec(STANDARD_FIELDS, user_limits=user_limits)
         self.extra_codec = MessageCodec(EXTRA_FIELDS, user_limits=user_limits)
+        # Unknown status values already warned about; every poll repeats them
+        self._unknown_statuses: set[int] = set()
 
     def decode(self, raw_msg: bytes) -> Message:
         """Decode a heat pump message based on its packet type.
@@ -809,6 +852,18 @@ class HeatPumpProtocol:
         packet_type = raw_msg[3]
 
         if packet_type == 0x10:
+            if len(raw_msg) > 4:
+                status = raw_msg[4]
+                # No-data packets carry no field values; skip the field loop
+                if status == NO_DATA_STATUS:
+                    logger.debug("Standard packet without data (status 0x%02x)", status)
+                    return Message(packet_type=packet_type, fields={})
+                if status not in HP_STATUS_MAP:
+                    if status in self._unknown_statuses:
+                        logger.debug("Unknown heat pump status 0x%02x in standard packet", status)
+                    else:
+                        self._unknown_statuses.add(status)
+                        logger.warning("Unknown heat pump status 0x%02x in standard packet", status)
             logger.debug("Decoding standard packet (0x10)")
             return self.standard_codec.decode(raw_msg, packet_type)
         elif packet_type == 0x21:
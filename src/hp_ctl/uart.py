@@ -3,7 +3,6 @@
 
 import logging
 import threading
-import time
 from typing import Callable, Optional
 
 import serial
@@ -15,6 +14,55 @@ START_DELIMITER = 0x71
 MESSAGE_MIN_LENGTH = 6
 
 
+def calculate_checksum(data: bytes) -> int:
+    """Calculate the frame checksum byte.
+
+    The protocol uses an 8-bit two's complement sum: the checksum is chosen
+    so that the sum of all frame bytes including it is 0 modulo 256.
+
+    Args:
+        data: Frame bytes excluding the checksum.
+
+    Returns:
+        Checksum byte value.
+    """
+    return -sum(data) & 0xFF
+
+
+def extract_frame(rx_buf: bytearray) -> Optional[bytes]:
+    """Cut the next complete frame out of a receive buffer.
+
+    Bytes before the start delimiter are discarded. The returned frame is
+    removed from the buffer; an incomplete frame is left in place.
+
+    Args:
+        rx_buf: Receive buffer, modified in place.
+
+    Returns:
+        Complete frame (delimiter + length + payload + checksum), or None if
+        the buffer does not hold one yet.
+    """
+    # Discard anything before the start delimiter
+    start = rx_buf.find(START_DELIMITER)
+    if start < 0:
+        rx_buf.clear()
+        return None
+    if start > 0:
+        del rx_buf[:start]
+
+    # Expected: start(1) + length(1) + payload + checksum(1)
+    if len(rx_buf) < 2:
+        return None
+    frame_length = 3 + rx_buf[1]
+    if len(rx_buf) < frame_length:
+        return None
+    # Copy the frame once via a view; the view must be released before resizing
+    with memoryview(rx_buf) as view:
+        message = view[:frame_length].tobytes()
+    del rx_buf[:frame_length]
+    return message
+
+
 class UartTransceiver:
     """UART transceiver for background listening, sending, and message validation.
 
@@ -28,6 +76,7 @@ class UartTransceiver:
         baudrate: int = 9600,
         on_message: Optional[Callable[[bytes], None]] = None,
         poll_interval: float = 0.1,
+        start_listener: bool = True,
     ) -> None:
         """Initialize UART connection and start listening.
 
@@ -35,13 +84,20 @@ class UartTransceiver:
             port: Serial port path (e.g., '/dev/ttyUSB0').
             baudrate: Baud rate for serial communication. Defaults to 9600.
             on_message: Callback function invoked with validated message bytes.
-            poll_interval: Time in seconds between polling attempts. Defaults to 0.1.
+            poll_interval: Back-off in seconds after a read error. Defaults to 0.1.
+                The listener itself blocks in read() and does not poll.
+            start_listener: Start the background listening thread. Defaults to True.
+                Without it, messages are only read by calling receive_and_validate().
         """
         self.port = port
         self.baudrate = baudrate
         self.on_message = on_message
         self.poll_interval = poll_interval
         self.listening = True
+        # Set on close() to interrupt the error back-off immediately
+        self._stop_event = threading.Event()
+        # Receive buffer; bytes following a complete frame are kept for the next read
+        self._rx_buf = bytearray()
         logger.debug("Opening UART connection: %s at %d baud (9600E1)", port, baudrate)
         self.serial_conn = serial.Serial(
             port=port,
@@ -52,11 +108,19 @@ class UartTransceiver:
             timeout=1.0,
         )
         logger.info("UART connection opened: %s (9600E1)", port)
-        self.thread = threading.Thread(
-            target=self._listen_loop, daemon=True, name="UART-Listener"
-        )
-        self.thread.start()
-        logger.debug("Listening thread started")
+        # USB-serial adapters (e.g. FTDI) otherwise batch RX bytes on a ~16 ms timer
+        try:
+            self.serial_conn.set_low_latency_mode(True)
+            logger.debug("UART low-latency mode enabled")
+        except (ValueError, AttributeError, NotImplementedError) as e:
+            logger.debug("Low-latency mode not available: %s", e)
+        self.thread: Optional[threading.Thread] = None
+        if start_listener:
+            self.thread = threading.Thread(
+                target=self._listen_loop, daemon=True, name="UART-Listener"
+            )
+            self.thread.start()
+            logger.debug("Listening thread started")
 
     def __enter__(self):
         """Context manager entry."""
@@ -70,12 +134,15 @@ class UartTransceiver:
         """Close UART connection and stop listening."""
         logger.debug("Closing UART connection")
         self.listening = False
-        # Close connection first to break any blocking read()
+        self._stop_event.set()
+        # Cancel and close first to break any blocking read()
         try:
+            self.serial_conn.cancel_read()
             self.serial_conn.close()
         except Exception as e:
             logger.debug("Error closing serial connection: %s", e)
-        self.thread.join(timeout=1.0)
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
         logger.info("UART connection closed")
 
     def send(self, data: bytes) -> None:
@@ -84,50 +151,44 @@ class UartTransceiver:
         Args:
             data: Complete message bytes excluding checksum (110 bytes from protocol.encode).
         """
-        checksum = (0 - sum(data)) & 0xFF
+        checksum = calculate_checksum(data)
         message = data + bytes([checksum])
-        logger.debug("Sending %d bytes: %s", len(message), message.hex())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Sending %d bytes: %s", len(message), message.hex())
         self.serial_conn.write(message)
 
     def read_message(self) -> bytes:
         """Read a complete message from UART.
 
-        Implements delimiter-based framing:
-        - Waits for 0x71 start delimiter
-        - Reads length byte
-        - Reads payload and checksum
-        - Returns complete framed message
+        Implements delimiter-based framing on a receive buffer:
+        - Drains all bytes waiting in the driver with a single read
+        - Discards bytes before the 0x71 start delimiter
+        - Waits until length byte, payload and checksum are buffered
+        - Returns complete framed message, keeping any following bytes buffered
 
         Returns:
             Complete message bytes (delimiter + length + payload + checksum),
             or empty bytes if connection is closed or timeout occurs.
         """
-
-        # Wait for start delimiter
+        rx_buf = self._rx_buf
+        serial_conn = self.serial_conn
+        read = serial_conn.read
         while self.listening:
-            byte = self.serial_conn.read(1)
-            if not byte:
+            message = extract_frame(rx_buf)
+            if message is not None:
+                return message
+
+            # Block for at least one byte, then take whatever else is waiting
+            chunk = read(max(1, serial_conn.in_waiting))
+            if not chunk:
+                # Connection closed or timeout; drop any incomplete message
+                rx_buf.clear()
                 return b""
-            if byte[0] == START_DELIMITER:
-                break
-        else:
-            return b""
-
-        # Read length byte
-        length_byte = self.serial_conn.read(1)
-        if not length_byte:
-            return b""  # Connection closed or timeout
-
-        declared_length = length_byte[0]
-        # Read payload and checksum (declared_length bytes + 1 checksum byte)
-        payload_and_checksum = self.serial_conn.read(declared_length + 1)
-        if len(payload_and_checksum) != declared_length + 1:
-            return b""  # Incomplete message
-
-        # Assemble complete message: delimiter + length + payload + checksum
-        return byte + length_byte + payload_and_checksum
-
-    def validate_length(self, message: bytes) -> bool:
+            rx_buf += chunk
+        return b""
+
+    @staticmethod
+    def validate_length(message: bytes) -> bool:
         """Validate packet length.
 
         Checks that the message has a minimum length and that the declared
@@ -150,7 +211,8 @@ class UartTransceiver:
             )
         return valid
 
-    def validate_crc(self, message: bytes) -> bool:
+    @staticmethod
+    def validate_crc(message: bytes) -> bool:
         """Validate CRC.
 
         Computes and verifies the checksum of the message. The checksum is
@@ -166,7 +228,7 @@ class UartTransceiver:
             logger.warning("CRC validation failed: message too short")
             return False
 
-        # Sum ALL bytes including the checksum
+        # Sum ALL bytes including the checksum; no slice, so nothing is copied
         total_sum = sum(message) & 0xFF
         valid = total_sum == 0
 
@@ -190,27 +252,31 @@ class UartTransceiver:
             # No data available (timeout or connection closed)
             return None
         if self.validate_length(message) and self.validate_crc(message):
-            logger.debug("Message parsed: %s", message.hex())
+            # Avoid building the hex string when debug logging is off
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Message parsed: %s", message.hex())
             return message
         return None
 
     def _listen_loop(self) -> None:
         """Background loop to check for data and emit via callback.
 
-        Periodically checks for data and invokes the on_message callback
-        with validated messages.
+        Blocks in the serial read until data arrives (or the read timeout
+        expires) and invokes the on_message callback with validated messages.
+        The callback is bound once when the thread starts.
         """
+        receive_and_validate = self.receive_and_validate
+        on_message = self.on_message
         while self.listening:
             try:
-                message = self.receive_and_validate()
-                if message and self.on_message:
+                message = receive_and_validate()
+                if message and on_message is not None:
                     logger.debug("Invoking callback with message")
-                    self.on_message(message)
-                # Always sleep to prevent busy-wait
-                time.sleep(self.poll_interval)
+                    on_message(message)
             except NotImplementedError:
                 # Expected during development; re-raise to avoid silent failures
                 raise
             except Exception as e:  # pylint: disable=broad-except
                 logger.exception("UART error: %s", e)
-                time.sleep(self.poll_interval)
+                if self._stop_event.wait(timeout=self.poll_interval):
+                    break
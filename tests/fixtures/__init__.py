@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: Copyright (c) 2025 Jonas Remmert <j.remmert@mailbox.org>
+
+"""Shared test data loaded from the YAML fixture files."""
+
+import functools
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+DECODER_TEST_CASES_PATH = Path(__file__).parent / "decoder_test_cases.yaml"
+
+# libyaml's C parser and emitter when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+@functools.cache
+def load_decoder_test_cases() -> dict[str, Any]:
+    """Parse the decoder test cases once per test session.
+
+    Returns:
+        Mapping of case id to case data. Shared between callers; do not modify.
+    """
+    with open(DECODER_TEST_CASES_PATH, "r") as f:
+        return yaml.load(f, Loader=_SafeLoader)["test_cases"]
+
+
+@functools.cache
+def decoder_test_case_bytes(name: str) -> bytes:
+    """Return the raw message bytes of a decoder test case."""
+    # fromhex() skips ASCII whitespace, so the multi-line YAML block decodes as-is
+    return bytes.fromhex(load_decoder_test_cases()[name]["raw_hex"])
+
+
+def write_config(path: Path, config: dict[str, Any]) -> str:
+    """Write a config mapping as YAML.
+
+    Returns:
+        The path as a string, ready to pass as config_path.
+    """
+    path.write_text(yaml.dump(config, Dumper=_SafeDumper))
+    return str(path)
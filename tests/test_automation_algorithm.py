@@ -8,6 +8,11 @@ import pytest
 from hp_ctl.automation.algorithm import HeatingAlgorithm
 
 
+def at_time(hhmm: str) -> datetime:
+    """Return 1900-01-01 at HH:MM, like datetime.strptime(hhmm, "%H:%M")."""
+    return datetime.fromisoformat(f"1900-01-01T{hhmm}")
+
+
 @pytest.fixture
 def algorithm():
     config = {
@@ -24,19 +29,19 @@ def algorithm():
 
 def test_night_off_detection(algorithm):
     # During night off
-    t1 = datetime.strptime("23:00", "%H:%M")
+    t1 = at_time("23:00")
     assert algorithm.is_in_night_off_period(t1) is True
 
-    t2 = datetime.strptime("02:00", "%H:%M")
+    t2 = at_time("02:00")
     assert algorithm.is_in_night_off_period(t2) is True
 
     # Day time
-    t3 = datetime.strptime("12:00", "%H:%M")
+    t3 = at_time("12:00")
     assert algorithm.is_in_night_off_period(t3) is False
 
 
 def test_kwh_bucket_logic(algorithm):
-    now = datetime.strptime("12:00", "%H:%M")
+    now = at_time("12:00")
 
     # Demand met
     action = algorithm.decide(
@@ -59,7 +64,7 @@ def test_kwh_bucket_logic(algorithm):
 
 def test_ramping_logic_low_delta(algorithm):
     """Test target increase when delta_t is low."""
-    now = datetime.strptime("12:00", "%H:%M")
+    now = at_time("12:00")
 
     # delta_t = 35 - 33 = 2.0 (<= min_delta_t 3.0)
     action = algorithm.decide(
@@ -82,7 +87,7 @@ def test_ramping_logic_low_delta(algorithm):
 
 def test_ramping_logic_high_delta(algorithm):
     """Test target maintenance when delta_t is high."""
-    now = datetime.strptime("12:00", "%H:%M")
+    now = at_time("12:00")
 
     # delta_t = 35 - 30 = 5.0 (> min_delta_t 3.0)
     action = algorithm.decide(
@@ -105,7 +110,7 @@ def test_ramping_logic_high_delta(algorithm):
 
 def test_dhw_trigger_window(algorithm):
     """Test DHW trigger during its window."""
-    now = datetime.strptime("13:05", "%H:%M")
+    now = at_time("13:05")
 
     action = algorithm.decide(
         current_time=now,
@@ -128,7 +133,7 @@ def test_dhw_trigger_window(algorithm):
 
 def test_dhw_completion(algorithm):
     """Test switching back to Heat once DHW is done."""
-    now = datetime.strptime("14:30", "%H:%M")  # Past 1-hour trigger window
+    now = at_time("14:30")  # Past 1-hour trigger window
 
     action = algorithm.decide(
         current_time=now,
@@ -223,26 +228,18 @@ def test_is_before_heating_start_in_delayed_window(algorithm_with_night_off):
     """HP should stay off during delayed start window."""
     # Night off ends at 07:30, calculated start is 10:00
     # At 08:00, we're in the delayed window
-    assert algorithm_with_night_off.is_before_heating_start(
-        datetime.strptime("08:00", "%H:%M"), "10:00"
-    )
+    assert algorithm_with_night_off.is_before_heating_start(at_time("08:00"), "10:00")
 
     # At 09:59, still in delayed window
-    assert algorithm_with_night_off.is_before_heating_start(
-        datetime.strptime("09:59", "%H:%M"), "10:00"
-    )
+    assert algorithm_with_night_off.is_before_heating_start(at_time("09:59"), "10:00")
 
 
 def test_is_before_heating_start_past_start_time(algorithm_with_night_off):
     """HP follows normal logic after calculated start time."""
     # At 10:00 or later, not in delayed window
-    assert not algorithm_with_night_off.is_before_heating_start(
-        datetime.strptime("10:00", "%H:%M"), "10:00"
-    )
+    assert not algorithm_with_night_off.is_before_heating_start(at_time("10:00"), "10:00")
 
-    assert not algorithm_with_night_off.is_before_heating_start(
-        datetime.strptime("11:00", "%H:%M"), "10:00"
-    )
+    assert not algorithm_with_night_off.is_before_heating_start(at_time("11:00"), "10:00")
 
 
 def test_is_before_heating_start_before_night_off_end(algorithm_with_night_off):
@@ -252,16 +249,14 @@ def test_is_before_heating_start_before_night_off_end(algorithm_with_night_off):
     """
     # At 06:00, still in night off (before 07:30 end)
     # This should return False because night_off check handles it
-    assert not algorithm_with_night_off.is_before_heating_start(
-        datetime.strptime("06:00", "%H:%M"), "10:00"
-    )
+    assert not algorithm_with_night_off.is_before_heating_start(at_time("06:00"), "10:00")
 
 
 def test_decide_delayed_start(algorithm_with_night_off):
     """Integration: decide() returns Off with delayed start reason."""
     # Warm day (10C) -> calculated start around 09:27
     # At 08:00, should be delayed
-    now = datetime.strptime("08:00", "%H:%M")
+    now = at_time("08:00")
 
     action = algorithm_with_night_off.decide(
         current_time=now,
@@ -285,7 +280,7 @@ def test_decide_past_delayed_start(algorithm_with_night_off):
     """After delayed start time, HP follows normal heating logic."""
     # At 10C, calculated start is 10:44 (based on 0-17C range mapping to 07:30-13:00)
     # At 11:00, should follow normal logic (heating)
-    now = datetime.strptime("11:00", "%H:%M")
+    now = at_time("11:00")
 
     action = algorithm_with_night_off.decide(
         current_time=now,
@@ -310,7 +305,7 @@ def test_decide_cold_day_no_delay(algorithm_with_night_off):
     """On cold days, HP starts immediately after night_off ends."""
     # Cold day (-5C) -> calculated start is 07:30 (earliest)
     # At 07:31, should start heating immediately
-    now = datetime.strptime("07:31", "%H:%M")
+    now = at_time("07:31")
 
     action = algorithm_with_night_off.decide(
         current_time=now,
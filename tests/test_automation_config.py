@@ -3,128 +3,80 @@
 
 """Tests for automation config validation."""
 
+import re
+
 import pytest
 
 from hp_ctl.automation.config import get_heat_demand_for_temp, validate_automation_config
 
 
-def test_validate_minimal_config():
-    """Test validation of minimal valid config."""
-    config = {
+def make_valid_config() -> dict:
+    """Return a fresh, minimal valid automation config."""
+    return {
         "enabled": True,
-        "weather": {
-            "latitude": 52.52,
-            "longitude": 13.41,
-        },
+        "weather": {"latitude": 52.52, "longitude": 13.41},
         "heat_demand_map": [
             {"outdoor_temp": 0, "daily_kwh": 35},
             {"outdoor_temp": 10, "daily_kwh": 20},
         ],
-        "storage": {
-            "db_path": "/tmp/test.db",
-            "retention_days": 30,
-        },
+        "storage": {"db_path": "/tmp/test.db", "retention_days": 30},
     }
 
+
+# (mutation applied to a valid config, expected error message)
+INVALID_CONFIG_CASES = {
+    "missing_weather_section": (
+        lambda c: c.pop("weather"),
+        "Missing required section: automation.weather",
+    ),
+    "invalid_latitude": (
+        lambda c: c["weather"].update(latitude=100.0),
+        "Invalid latitude",
+    ),
+    "heat_demand_map_too_few_entries": (
+        lambda c: c["heat_demand_map"].pop(),
+        "at least 2 entries",
+    ),
+    "heat_demand_map_not_ascending": (
+        lambda c: c["heat_demand_map"].reverse(),
+        "ascending order",
+    ),
+    "night_off_period_invalid_format": (
+        lambda c: c.update(night_off_period={"start": "25:00", "end": "07:30"}),
+        "Invalid time format in night_off_period.start",
+    ),
+    "night_off_period_not_a_string": (
+        # Unquoted 22:30 is loaded by YAML 1.1 as the sexagesimal integer 1350
+        lambda c: c.update(night_off_period={"start": 1350, "end": "07:30"}),
+        "Invalid time format in night_off_period.start",
+    ),
+    "dhw_invalid_start_time": (
+        lambda c: c.update(dhw={"enabled": True, "start_time": "13:00:00", "target_temp": 50}),
+        "Invalid DHW start_time",
+    ),
+    "night_off_period_missing_fields": (
+        lambda c: c.update(night_off_period={"start": "22:30"}),
+        "night_off_period must have 'start' and 'end'",
+    ),
+}
+
+
+def test_validate_minimal_config():
+    """Test validation of minimal valid config."""
     # Should not raise
-    validate_automation_config(config)
+    validate_automation_config(make_valid_config())
 
 
 def test_validate_disabled_config():
     """Test that 'enabled' field is optional (controller always runs)."""
     # Even with enabled=False, all sections are required since controller runs
-    config = {
-        "enabled": False,
-        "weather": {
-            "latitude": 52.52,
-            "longitude": 13.41,
-        },
-        "heat_demand_map": [
-            {"outdoor_temp": 0, "daily_kwh": 35},
-            {"outdoor_temp": 10, "daily_kwh": 20},
-        ],
-        "storage": {
-            "db_path": "/tmp/test.db",
-            "retention_days": 30,
-        },
-    }
+    config = make_valid_config()
+    config["enabled"] = False
 
     # Should not raise - enabled field just controls startup mode
     validate_automation_config(config)
 
 
-def test_validate_missing_weather_section():
-    """Test error on missing weather section."""
-    config = {
-        "enabled": True,
-        "heat_demand_map": [
-            {"outdoor_temp": 0, "daily_kwh": 35},
-            {"outdoor_temp": 10, "daily_kwh": 20},
-        ],
-        "storage": {"db_path": "/tmp/test.db", "retention_days": 30},
-    }
-
-    with pytest.raises(ValueError, match="Missing required section: automation.weather"):
-        validate_automation_config(config)
-
-
-def test_validate_invalid_latitude():
-    """Test error on invalid latitude."""
-    config = {
-        "enabled": True,
-        "weather": {
-            "latitude": 100.0,  # Invalid: > 90
-            "longitude": 13.41,
-        },
-        "heat_demand_map": [
-            {"outdoor_temp": 0, "daily_kwh": 35},
-            {"outdoor_temp": 10, "daily_kwh": 20},
-        ],
-        "storage": {"db_path": "/tmp/test.db", "retention_days": 30},
-    }
-
-    with pytest.raises(ValueError, match="Invalid latitude"):
-        validate_automation_config(config)
-
-
-def test_validate_heat_demand_map_too_few_entries():
-    """Test error when heat demand map has < 2 entries."""
-    config = {
-        "enabled": True,
-        "weather": {
-            "latitude": 52.52,
-            "longitude": 13.41,
-        },
-        "heat_demand_map": [
-            {"outdoor_temp": 0, "daily_kwh": 35},
-            # Only 1 entry
-        ],
-        "storage": {"db_path": "/tmp/test.db", "retention_days": 30},
-    }
-
-    with pytest.raises(ValueError, match="at least 2 entries"):
-        validate_automation_config(config)
-
-
-def test_validate_heat_demand_map_not_ascending():
-    """Test error when temps are not in ascending order."""
-    config = {
-        "enabled": True,
-        "weather": {
-            "latitude": 52.52,
-            "longitude": 13.41,
-        },
-        "heat_demand_map": [
-            {"outdoor_temp": 10, "daily_kwh": 20},
-            {"outdoor_temp": 0, "daily_kwh": 35},  # Out of order
-        ],
-        "storage": {"db_path": "/tmp/test.db", "retention_days": 30},
-    }
-
-    with pytest.raises(ValueError, match="ascending order"):
-        validate_automation_config(config)
-
-
 def test_get_heat_demand_exact_match():
     """Test heat demand calculation for exact match."""
     heat_demand_map = [
@@ -152,6 +104,20 @@ def test_get_heat_demand_interpolation():
     assert result == 27.5
 
 
+def test_get_heat_demand_multiple_segments():
+    """Test heat demand interpolation picks the right segment of a longer map."""
+    heat_demand_map = [
+        {"outdoor_temp": -10, "daily_kwh": 60},
+        {"outdoor_temp": 0, "daily_kwh": 40},
+        {"outdoor_temp": 10, "daily_kwh": 20},
+        {"outdoor_temp": 20, "daily_kwh": 0},
+    ]
+
+    assert get_heat_demand_for_temp(heat_demand_map, -5) == 50.0
+    assert get_heat_demand_for_temp(heat_demand_map, 0) == 40
+    assert get_heat_demand_for_temp(heat_demand_map, 15) == 10.0
+
+
 def test_get_heat_demand_below_range():
     """Test heat demand for temp below lowest mapping."""
     heat_demand_map = [
@@ -178,77 +144,20 @@ def test_get_heat_demand_above_range():
 
 def test_validate_night_off_period():
     """Test validation of night_off_period (singular)."""
-    config = {
-        "enabled": True,
-        "weather": {
-            "latitude": 52.52,
-            "longitude": 13.41,
-        },
-        "heat_demand_map": [
-            {"outdoor_temp": 0, "daily_kwh": 35},
-            {"outdoor_temp": 10, "daily_kwh": 20},
-        ],
-        "night_off_period": {
-            "start": "22:30",
-            "end": "07:30",
-        },
-        "storage": {
-            "db_path": "/tmp/test.db",
-            "retention_days": 30,
-        },
-    }
+    config = make_valid_config()
+    config["night_off_period"] = {"start": "22:30", "end": "07:30"}
 
     # Should not raise
     validate_automation_config(config)
 
 
-def test_validate_night_off_period_invalid_format():
-    """Test error on invalid time format in night_off_period."""
-    config = {
-        "enabled": True,
-        "weather": {
-            "latitude": 52.52,
-            "longitude": 13.41,
-        },
-        "heat_demand_map": [
-            {"outdoor_temp": 0, "daily_kwh": 35},
-            {"outdoor_temp": 10, "daily_kwh": 20},
-        ],
-        "night_off_period": {
-            "start": "25:00",  # Invalid hour
-            "end": "07:30",
-        },
-        "storage": {
-            "db_path": "/tmp/test.db",
-            "retention_days": 30,
-        },
-    }
-
-    with pytest.raises(ValueError, match="Invalid time format in night_off_period.start"):
-        validate_automation_config(config)
-
-
-def test_validate_night_off_period_missing_fields():
-    """Test error when night_off_period is missing start or end."""
-    config = {
-        "enabled": True,
-        "weather": {
-            "latitude": 52.52,
-            "longitude": 13.41,
-        },
-        "heat_demand_map": [
-            {"outdoor_temp": 0, "daily_kwh": 35},
-            {"outdoor_temp": 10, "daily_kwh": 20},
-        ],
-        "night_off_period": {
-            "start": "22:30",
-            # Missing 'end'
-        },
-        "storage": {
-            "db_path": "/tmp/test.db",
-            "retention_days": 30,
-        },
-    }
+@pytest.mark.parametrize(
+    "mutate,message", INVALID_CONFIG_CASES.values(), ids=INVALID_CONFIG_CASES.keys()
+)
+def test_validate_invalid_config(mutate, message):
+    """Test that each invalid config is rejected with a descriptive error."""
+    config = make_valid_config()
+    mutate(config)
 
-    with pytest.raises(ValueError, match="night_off_period must have 'start' and 'end'"):
+    with pytest.raises(ValueError, match=re.escape(message)):
         validate_automation_config(config)
@@ -6,14 +6,16 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
-import yaml
 
+from hp_ctl.automation import AutomationController
 from hp_ctl.main import Application
+from hp_ctl.mqtt import MqttClient
+from tests.fixtures import write_config
 
 
-@pytest.fixture
-def automation_config(tmp_path):
-    """Create a temporary config file with automation enabled."""
+@pytest.fixture(scope="module")
+def automation_config(tmp_path_factory):
+    """Create a config file with automation enabled (read-only, shared by the module)."""
     config = {
         "uart": {"port": "/dev/ttyUSB0", "baudrate": 9600},
         "mqtt": {"broker": "localhost", "port": 1883},
@@ -24,88 +26,67 @@ def automation_config(tmp_path):
                 {"outdoor_temp": 0, "daily_kwh": 35},
                 {"outdoor_temp": 10, "daily_kwh": 20},
             ],
-            "storage": {"db_path": str(tmp_path / "auto.db"), "retention_days": 30},
+            "storage": {"db_path": ":memory:", "retention_days": 30},
         },
     }
-    config_file = tmp_path / "config.yaml"
-    with open(config_file, "w") as f:
-        yaml.dump(config, f)
-    return str(config_file)
+    return write_config(tmp_path_factory.mktemp("automation") / "config.yaml", config)
 
 
-class TestAutomationIntegration:
-    """Integration tests for automation module."""
+@pytest.fixture
+def mock_mqtt():
+    """Create mock MQTT client."""
+    return MagicMock(spec=MqttClient)
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    @patch("hp_ctl.automation.controller.WeatherAPIClient")
-    def test_automation_init_and_discovery(
-        self, mock_weather_class, mock_uart, mock_mqtt_class, automation_config
-    ):
-        """Test that automation initializes and publishes discovery."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
 
+@pytest.fixture
+def app(automation_config, mock_mqtt):
+    """Create an application with an automation controller on a mocked MQTT client."""
+    with patch("hp_ctl.automation.controller.WeatherAPIClient") as mock_weather_class:
         # Ensure weather client doesn't return mocks that break math
-        mock_weather = MagicMock()
-        mock_weather_class.return_value = mock_weather
-        mock_weather.get_last_data.return_value = None
+        mock_weather_class.return_value.get_last_data.return_value = None
 
         app = Application(config_path=automation_config)
         app.mqtt_client = mock_mqtt
-
-        from hp_ctl.automation import AutomationController
-
         app.automation_controller = AutomationController(
             config=app.config["automation"],
             mqtt_client=app.mqtt_client,
             ha_mapper=app.ha_mapper,
         )
+        yield app
+        app.automation_controller.stop()
+
+
+class TestAutomationIntegration:
+    """Integration tests for automation module."""
+
+    def test_automation_init_and_discovery(self, app, mock_mqtt):
+        """Test that automation initializes and publishes discovery."""
         app.automation_controller.start()
 
         # Check discovery calls for automation
         discovery_calls = [
             call
             for call in mock_mqtt.publish.call_args_list
-            if "homeassistant/sensor/aquarea_k_automation" in str(call)
-            or "homeassistant/select/aquarea_k_automation" in str(call)
+            if call.args[0].startswith(
+                (
+                    "homeassistant/sensor/aquarea_k_automation",
+                    "homeassistant/select/aquarea_k_automation",
+                )
+            )
         ]
 
         # We expect 11 entities (1 select + 10 sensors including heating_start_time)
         assert len(discovery_calls) == 11
 
         # Check specific entity
-        mode_discovery = [c for c in discovery_calls if "mode/config" in str(c)]
+        mode_discovery = [c for c in discovery_calls if c.args[0].endswith("mode/config")]
         assert len(mode_discovery) == 1
         # Payload is second arg, check it contains the topics
-        payload = mode_discovery[0][0][1]
+        payload = mode_discovery[0].args[1]
         assert payload["state_topic"] == "hp_ctl/aquarea_k/automation/mode"
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    @patch("hp_ctl.automation.controller.WeatherAPIClient")
-    def test_automation_sensor_publishing(
-        self, mock_weather_class, mock_uart, mock_mqtt_class, automation_config
-    ):
+    def test_automation_sensor_publishing(self, app, mock_mqtt):
         """Test that automation publishes individual sensor data."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-
-        mock_weather = MagicMock()
-        mock_weather_class.return_value = mock_weather
-        mock_weather.get_last_data.return_value = None
-
-        app = Application(config_path=automation_config)
-        app.mqtt_client = mock_mqtt
-
-        from hp_ctl.automation import AutomationController
-
-        app.automation_controller = AutomationController(
-            config=app.config["automation"],
-            mqtt_client=app.mqtt_client,
-            ha_mapper=app.ha_mapper,
-        )
-
         # Simulate receiving outdoor temp from HP
         app.automation_controller._on_mqtt_state_message(
             "hp_ctl/aquarea_k/state/outdoor_temp", "7.5"
@@ -116,35 +97,12 @@ class TestAutomationIntegration:
 
         # Should also publish to status JSON
         status_calls = [
-            c for c in mock_mqtt.publish.call_args_list if "automation/status" in str(c)
+            c for c in mock_mqtt.publish.call_args_list if c.args[0].endswith("automation/status")
         ]
         assert len(status_calls) > 0
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    @patch("hp_ctl.automation.controller.WeatherAPIClient")
-    def test_automation_mode_switching(
-        self, mock_weather_class, mock_uart, mock_mqtt_class, automation_config
-    ):
+    def test_automation_mode_switching(self, app, mock_mqtt):
         """Test switching automation mode via MQTT."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-
-        mock_weather = MagicMock()
-        mock_weather_class.return_value = mock_weather
-        mock_weather.get_last_data.return_value = None
-
-        app = Application(config_path=automation_config)
-        app.mqtt_client = mock_mqtt
-
-        from hp_ctl.automation import AutomationController
-
-        app.automation_controller = AutomationController(
-            config=app.config["automation"],
-            mqtt_client=app.mqtt_client,
-            ha_mapper=app.ha_mapper,
-        )
-
         # Initial mode should be True (based on config enabled: True)
         assert app.automation_controller.automatic_mode_enabled is True
 
@@ -3,9 +3,7 @@
 
 """Tests for automation storage module."""
 
-import tempfile
 from datetime import datetime, timedelta
-from pathlib import Path
 
 import pytest
 
@@ -14,12 +12,10 @@ from hp_ctl.automation.storage import AutomationStorage, HeatPumpSnapshot
 
 @pytest.fixture
 def temp_db():
-    """Create temporary database for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = Path(tmpdir) / "test.db"
-        storage = AutomationStorage(str(db_path))
-        yield storage
-        storage.close()
+    """Create temporary in-memory database for testing."""
+    storage = AutomationStorage(":memory:")
+    yield storage
+    storage.close()
 
 
 def test_database_initialization(temp_db):
@@ -70,6 +66,21 @@ def test_insert_and_retrieve_snapshot(temp_db):
     assert retrieved.zone1_actual_temp == 38.0
 
 
+def test_insert_snapshots_bulk(temp_db):
+    """Test inserting several snapshots in one transaction."""
+    base = datetime(2025, 12, 26, 12, 0, 0)
+    snapshots = [
+        HeatPumpSnapshot(timestamp=base + timedelta(minutes=i), outdoor_temp=float(i))
+        for i in range(5)
+    ]
+
+    temp_db.insert_snapshots(snapshots)
+
+    assert temp_db.get_snapshot_count() == 5
+    stored = temp_db.get_snapshots(base, base + timedelta(hours=1))
+    assert [s.outdoor_temp for s in stored] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
 def test_daily_summary_calculation(temp_db):
     """Test daily summary calculation with energy integration."""
     # Create snapshots over a day
@@ -78,16 +89,17 @@ def test_daily_summary_calculation(temp_db):
     # Simulate heat pump running at constant power for 1 hour
     # Heat generation: 3000 W, Consumption: 1000 W
     # Expected: 3 kWh heat, 1 kWh consumption, COP = 3.0
-    for i in range(13):  # 0-12 in 5-minute intervals = 1 hour
-        timestamp = base_time + timedelta(minutes=i * 5)
-        snapshot = HeatPumpSnapshot(
-            timestamp=timestamp,
+    snapshots = [
+        HeatPumpSnapshot(
+            timestamp=base_time + timedelta(minutes=i * 5),
             outdoor_temp=5.0,
             heat_power_generation=3000.0,  # W
             heat_power_consumption=1000.0,  # W
             hp_status="On",
         )
-        temp_db.insert_snapshot(snapshot)
+        for i in range(13)  # 0-12 in 5-minute intervals = 1 hour
+    ]
+    temp_db.insert_snapshots(snapshots)
 
     # Calculate daily summary
     summary = temp_db.get_daily_summary(base_time)
@@ -141,6 +153,19 @@ def test_cleanup_old_data(temp_db):
     assert snapshots[0].outdoor_temp == 5.0
 
 
+def test_file_database(tmp_path):
+    """Test that a file-backed database is created, including its directory."""
+    db_path = tmp_path / "data" / "test.db"
+    storage = AutomationStorage(str(db_path))
+    try:
+        storage.insert_snapshot(HeatPumpSnapshot(timestamp=datetime(2025, 12, 26, 12, 0, 0)))
+        assert storage.get_snapshot_count() == 1
+    finally:
+        storage.close()
+
+    assert db_path.is_file()
+
+
 def test_no_summary_for_empty_day(temp_db):
     """Test daily summary returns None for days with no data."""
     date = datetime(2025, 12, 26)
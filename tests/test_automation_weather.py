@@ -3,13 +3,13 @@
 
 """Tests for automation weather module."""
 
-import time
-from datetime import datetime
-from unittest.mock import MagicMock, patch
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, call, patch
 
 import pytest
 
-from hp_ctl.automation.weather import WeatherAPIClient, WeatherData
+from hp_ctl.automation.weather import RETRY_INTERVAL, WeatherAPIClient, WeatherData
 
 
 @pytest.fixture
@@ -160,7 +160,8 @@ def test_weather_client_start_stop(mock_get, mock_response):
     mock_get.return_value.json.return_value = mock_response
     mock_get.return_value.raise_for_status = MagicMock()
 
-    on_data = MagicMock()
+    fetched = threading.Event()
+    on_data = MagicMock(side_effect=lambda _data: fetched.set())
     client = WeatherAPIClient(
         latitude=52.52,
         longitude=13.41,
@@ -172,8 +173,8 @@ def test_weather_client_start_stop(mock_get, mock_response):
     assert client._thread is not None
     assert client._thread.is_alive()
 
-    # Wait a bit for initial fetch
-    time.sleep(0.5)
+    # Wait for initial fetch
+    assert fetched.wait(timeout=2.0)
 
     # Verify callback was invoked
     assert on_data.call_count >= 1
@@ -188,8 +189,7 @@ def test_weather_client_start_stop(mock_get, mock_response):
 
     # Stop client
     client.stop()
-    time.sleep(0.2)
-    # Thread is set to None after stop
+    # stop() joins the thread and resets it
     assert client._thread is None
 
 
@@ -198,7 +198,8 @@ def test_weather_client_error_callback(mock_get):
     """Test error callback is invoked on fetch failure."""
     mock_get.side_effect = Exception("Network error")
 
-    on_error = MagicMock()
+    failed = threading.Event()
+    on_error = MagicMock(side_effect=lambda _msg: failed.set())
     client = WeatherAPIClient(
         latitude=52.52,
         longitude=13.41,
@@ -207,7 +208,7 @@ def test_weather_client_error_callback(mock_get):
 
     # Start client (will fail on initial fetch)
     client.start()
-    time.sleep(0.5)
+    assert failed.wait(timeout=2.0)
 
     # Verify error callback was invoked
     assert on_error.call_count >= 1
@@ -217,6 +218,96 @@ def test_weather_client_error_callback(mock_get):
     client.stop()
 
 
+@patch("hp_ctl.automation.weather.requests.get")
+def test_weather_client_stale_data_on_error(mock_get):
+    """Test that a failed fetch keeps recent data and reports it as stale, not an error."""
+    mock_get.side_effect = Exception("Network error")
+
+    on_error = MagicMock()
+    on_stale = MagicMock()
+    client = WeatherAPIClient(latitude=52.52, longitude=13.41, on_error=on_error, on_stale=on_stale)
+    last_good = WeatherData(
+        timestamp=datetime.now() - timedelta(hours=24),
+        outdoor_temp_forecast_24h=4.0,
+        date="2025-12-25",
+    )
+    client._last_data = last_good
+
+    assert client._update_and_notify("scheduled") is True
+
+    on_error.assert_not_called()
+    on_stale.assert_called_once()
+    assert "Network error" in on_stale.call_args[0][0]
+    assert client.get_last_data() is last_good
+
+    # Once the last data is too old, the error is reported (and still retried)
+    last_good.timestamp = datetime.now() - timedelta(hours=48)
+    assert client._update_and_notify("scheduled") is True
+
+    on_error.assert_called_once()
+    assert "Network error" in on_error.call_args[0][0]
+
+
+def test_weather_client_midnight_fetch_jitter():
+    """Test that the scheduled fetch is delayed by a random jitter after midnight."""
+    client = WeatherAPIClient(latitude=52.52, longitude=13.41, fetch_jitter=120.0)
+
+    with (
+        patch.object(client, "_update_and_notify", return_value=False),
+        patch.object(client, "_get_s_to_midnight", return_value=3600.0),
+        patch.object(client._stop_event, "wait", return_value=True) as mock_wait,
+        patch("hp_ctl.automation.weather.random.uniform", return_value=30.0) as mock_uniform,
+    ):
+        client._fetch_loop()
+
+    mock_uniform.assert_called_once_with(0, 120.0)
+    mock_wait.assert_called_once_with(timeout=3630.0)
+
+
+def test_weather_client_retry_after_failure():
+    """Test that a failed fetch is retried after a short back-off."""
+    client = WeatherAPIClient(latitude=52.52, longitude=13.41, fetch_jitter=0.0)
+
+    with (
+        # Startup fetch fails, the retry succeeds
+        patch.object(client, "_update_and_notify", side_effect=[True, False]) as mock_update,
+        patch.object(client, "_get_s_to_midnight", return_value=3600.0),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]) as mock_wait,
+    ):
+        client._fetch_loop()
+
+    assert mock_update.call_args_list == [call("startup"), call("retry")]
+    # Retry after the back-off, then back to the daily schedule
+    assert mock_wait.call_args_list == [
+        call(timeout=RETRY_INTERVAL.total_seconds()),
+        call(timeout=3600.0),
+    ]
+
+
+@patch("hp_ctl.automation.weather.requests.get")
+def test_weather_client_startup_failure_retry(mock_get, mock_response):
+    """Test that a failed first fetch without cached data is retried until it succeeds."""
+    good = MagicMock()
+    good.json.return_value = mock_response
+    mock_get.side_effect = [Exception("Network unreachable"), good]
+
+    on_data = MagicMock()
+    on_error = MagicMock()
+    client = WeatherAPIClient(latitude=52.52, longitude=13.41, on_data=on_data, on_error=on_error)
+
+    with (
+        patch.object(client, "_get_s_to_midnight", return_value=3600.0),
+        patch.object(client._stop_event, "wait", side_effect=[False, True]) as mock_wait,
+    ):
+        client._fetch_loop()
+
+    on_error.assert_called_once()
+    assert "Network unreachable" in on_error.call_args[0][0]
+    on_data.assert_called_once()
+    assert client.get_last_data().outdoor_temp_forecast_24h == 5.2
+    assert mock_wait.call_args_list[0] == call(timeout=RETRY_INTERVAL.total_seconds())
+
+
 @patch("hp_ctl.automation.weather.requests.get")
 def test_weather_client_multiple_start(mock_get, mock_response):
     """Test that starting client multiple times doesn't create multiple threads."""
@@ -3,10 +3,53 @@
 
 """Unit tests for CommandManager."""
 
-import time
-from unittest.mock import Mock, patch
+import threading
+from unittest.mock import Mock
 
 from hp_ctl.command_manager import CommandManager
+from hp_ctl.uart import UartTransceiver
+
+# 110-byte setting frames (0xf1 header, checksum is added by the UART layer)
+SETTING_COMMAND = b"\xf1" + bytes(109)
+SETTING_COMMAND_1 = b"\xf1" + b"\x01" * 109
+SETTING_COMMAND_2 = b"\xf1" + b"\x02" * 109
+
+
+class FakeClock:
+    """Manually advanced time source for CommandManager."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class SendWaiter:
+    """Lets a test block until the manager thread has sent a number of commands.
+
+    Wraps ``_send_command`` so waiters are woken only after the manager has
+    updated its state for the send, not while ``uart.send`` is still running.
+    """
+
+    def __init__(self, cm: CommandManager) -> None:
+        self._cm = cm
+        self._send_command = cm._send_command
+        self._sent = threading.Condition()
+        cm._send_command = self._send_and_notify
+
+    def _send_and_notify(self, *args, **kwargs) -> None:
+        self._send_command(*args, **kwargs)
+        with self._sent:
+            self._sent.notify_all()
+
+    def wait_for(self, count: int, timeout: float = 2.0) -> bool:
+        """Wait until at least ``count`` commands were sent over the UART mock."""
+        with self._sent:
+            return self._sent.wait_for(lambda: self._cm.uart.send.call_count >= count, timeout)
 
 
 class TestCommandManager:
@@ -14,7 +57,7 @@ class TestCommandManager:
 
     def test_query_command_format(self):
         """Verify query command has correct format (0x71 header)."""
-        uart_mock = Mock()
+        uart_mock = Mock(spec=UartTransceiver)
         cm = CommandManager(uart_mock)
 
         # Check query command format
@@ -28,7 +71,7 @@ class TestCommandManager:
 
     def test_extra_query_command_format(self):
         """Verify extra query command has correct format (0x71 header, 0x21 type)."""
-        uart_mock = Mock()
+        uart_mock = Mock(spec=UartTransceiver)
         cm = CommandManager(uart_mock)
 
         # Check extra query command format
@@ -42,22 +85,23 @@ class TestCommandManager:
 
     def test_extra_query_sequencing(self):
         """Verify extra query is sent after standard query response."""
-        uart_mock = Mock()
+        uart_mock = Mock(spec=UartTransceiver)
         cm = CommandManager(uart_mock)
+        waiter = SendWaiter(cm)
 
         # Start manager
         cm.start()
-        time.sleep(0.1)
 
         # Standard query should be sent immediately
+        assert waiter.wait_for(1)
         assert uart_mock.send.call_count == 1
         assert uart_mock.send.call_args[0][0][3] == 0x10
 
         # Simulate response
         cm.on_response_received()
-        time.sleep(0.6)
 
         # Extra query should be sent now
+        assert waiter.wait_for(2)
         assert uart_mock.send.call_count == 2
         assert uart_mock.send.call_args[0][0][3] == 0x21
 
@@ -65,17 +109,15 @@ class TestCommandManager:
 
     def test_first_query_sent_immediately(self):
         """Verify first query is sent immediately (no startup delay)."""
-        uart_mock = Mock()
+        uart_mock = Mock(spec=UartTransceiver)
         cm = CommandManager(uart_mock)
+        waiter = SendWaiter(cm)
 
         # Start manager
         cm.start()
 
-        # Give it a moment to start thread and send first query
-        time.sleep(0.2)
-
         # Verify query was sent
-        assert uart_mock.send.call_count >= 1
+        assert waiter.wait_for(1)
         first_call = uart_mock.send.call_args_list[0]
         assert first_call[0][0] == cm.query_command
 
@@ -84,43 +126,36 @@ class TestCommandManager:
 
     def test_query_interval_15s(self):
         """Verify queries are sent every 15 seconds."""
-        uart_mock = Mock()
-        cm = CommandManager(uart_mock)
-
-        # Use patch to mock time.time
-        with patch("hp_ctl.command_manager.time") as mock_time:
-            mock_time.time.return_value = 0.0
-
-            cm.start()
-            time.sleep(0.1)  # Let thread start
-
-            # First query at t=0
-            assert uart_mock.send.call_count >= 1
+        uart_mock = Mock(spec=UartTransceiver)
+        clock = FakeClock()
+        cm = CommandManager(uart_mock, clock=clock)
 
-            # Simulate response received to unlock state for extra query
-            cm.on_response_received()
-            time.sleep(0.6)
-            assert uart_mock.send.call_count == 2
-            cm.on_response_received()  # Unlock after extra query
+        # First query at t=0
+        cm._tick()
+        assert uart_mock.send.call_count == 1
 
-            # Advance time to 14s (not enough)
-            mock_time.time.return_value = 14.0
-            time.sleep(0.6)  # Wait for loop cycle
-            first_count = uart_mock.send.call_count
+        # Simulate response received to unlock state for extra query
+        cm.on_response_received()
+        cm._tick()
+        assert uart_mock.send.call_count == 2
+        cm.on_response_received()  # Unlock after extra query
 
-            # Advance time to 16s (should trigger second query sequence)
-            mock_time.time.return_value = 16.0
-            time.sleep(0.6)  # Wait for loop cycle
-            second_count = uart_mock.send.call_count
+        # Advance time to 14s (not enough)
+        clock.advance(14.0)
+        cm._tick()
+        assert uart_mock.send.call_count == 2
 
-            # Should have sent second sequence start
-            assert second_count > first_count
+        # Advance time to 16s (should trigger second query sequence)
+        clock.advance(2.0)
+        cm._tick()
 
-            cm.stop()
+        # Should have sent second sequence start
+        assert uart_mock.send.call_count == 3
+        assert uart_mock.send.call_args[0][0] == cm.query_command
 
     def test_response_unlock(self):
         """Verify on_response_received() unlocks waiting state."""
-        uart_mock = Mock()
+        uart_mock = Mock(spec=UartTransceiver)
         cm = CommandManager(uart_mock)
 
         # Simulate sending query
@@ -133,88 +168,76 @@ class TestCommandManager:
 
     def test_timeout_handling(self):
         """Verify timeout handling after 2 seconds."""
-        uart_mock = Mock()
-        cm = CommandManager(uart_mock)
+        uart_mock = Mock(spec=UartTransceiver)
+        clock = FakeClock()
+        cm = CommandManager(uart_mock, clock=clock)
 
-        # Use patch to mock time
-        with patch("hp_ctl.command_manager.time") as mock_time:
-            # Send query at t=0
-            mock_time.time.return_value = 0.0
-            cm._send_command(cm.query_command, is_query=True)
-            assert cm.waiting_for_response is True
+        # Send query at t=0
+        cm._send_command(cm.query_command, is_query=True)
+        assert cm.waiting_for_response is True
 
-            # Advance time to t=1.5 (not timeout yet)
-            mock_time.time.return_value = 1.5
-            cm._check_timeout()
-            assert cm.waiting_for_response is True
+        # Advance time to t=1.5 (not timeout yet)
+        clock.advance(1.5)
+        cm._check_timeout()
+        assert cm.waiting_for_response is True
 
-            # Advance time to t=2.1 (timeout)
-            mock_time.time.return_value = 2.1
-            cm._check_timeout()
-            assert cm.waiting_for_response is False
+        # Advance time to t=2.1 (timeout)
+        clock.advance(0.6)
+        cm._check_timeout()
+        assert cm.waiting_for_response is False
 
     def test_queue_command_prioritization(self):
         """Verify queued setting commands are prioritized over queries."""
-        uart_mock = Mock()
-        cm = CommandManager(uart_mock)
-
-        setting_command = b"\xf1" + b"\x00" * 109
-
-        # Mock time so query is due
-        with patch("hp_ctl.command_manager.time") as mock_time:
-            mock_time.time.return_value = 100.0
-            cm.last_query_time = 50.0  # Last query was 50s ago, so due
+        uart_mock = Mock(spec=UartTransceiver)
+        clock = FakeClock(100.0)
+        cm = CommandManager(uart_mock, clock=clock)
+        cm.last_query_time = 50.0  # Last query was 50s ago, so due
 
-            # Queue a setting command
-            cm.queue_command(setting_command)
+        # Queue a setting command
+        cm.queue_command(SETTING_COMMAND)
 
-            # Process loop once
-            cm.start()
-            time.sleep(0.6)  # Wait for one loop iteration (0.5s sleep)
+        # Process one step
+        cm._tick()
 
-            # First command sent should be the setting command, not the query
-            assert uart_mock.send.call_count >= 1
-            assert uart_mock.send.call_args_list[0][0][0][0] == 0xF1
-
-            cm.stop()
+        # First command sent should be the setting command, not the query
+        assert uart_mock.send.call_count == 1
+        assert uart_mock.send.call_args_list[0][0][0][0] == 0xF1
 
     def test_settings_no_lock(self):
         """Verify setting commands do NOT wait for response (fire-and-forget)."""
-        uart_mock = Mock()
-        cm = CommandManager(uart_mock)
-
-        setting_command_1 = b"\xf1" + b"\x01" * 109
-        setting_command_2 = b"\xf1" + b"\x02" * 109
+        uart_mock = Mock(spec=UartTransceiver)
+        clock = FakeClock()
+        cm = CommandManager(uart_mock, clock=clock)
+        waiter = SendWaiter(cm)
 
         # Set last_query_time to now to prevent immediate query during test
-        cm.last_query_time = time.time()
+        cm.last_query_time = clock()
 
-        cm.queue_command(setting_command_1)
-        cm.queue_command(setting_command_2)
+        cm.queue_command(SETTING_COMMAND_1)
+        cm.queue_command(SETTING_COMMAND_2)
 
         cm.start()
-        time.sleep(0.6)
 
         # First command sent
-        assert uart_mock.send.call_count >= 1
-        assert uart_mock.send.call_args_list[0][0][0] == setting_command_1
+        assert waiter.wait_for(1)
+        assert uart_mock.send.call_args_list[0][0][0] == SETTING_COMMAND_1
         # Should NOT be waiting for response
         assert cm.waiting_for_response is False
 
         # Second command should be sent almost immediately in next loop iteration
-        time.sleep(0.6)
-        assert uart_mock.send.call_count >= 2
-        assert uart_mock.send.call_args_list[1][0][0] == setting_command_2
+        assert waiter.wait_for(2)
+        assert uart_mock.send.call_args_list[1][0][0] == SETTING_COMMAND_2
 
         cm.stop()
 
     def test_stop_gracefully(self):
         """Verify manager stops gracefully."""
-        uart_mock = Mock()
+        uart_mock = Mock(spec=UartTransceiver)
         cm = CommandManager(uart_mock)
+        waiter = SendWaiter(cm)
 
         cm.start()
-        time.sleep(0.1)
+        assert waiter.wait_for(1)
 
         # Should be running
         assert cm._manager_thread is not None
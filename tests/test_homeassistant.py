@@ -7,20 +7,29 @@ from hp_ctl.homeassistant import HomeAssistantMapper
 from hp_ctl.protocol import EXTRA_FIELDS, STANDARD_FIELDS, Message
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mapper():
-    """Create a HomeAssistantMapper instance for testing."""
+    """Create a HomeAssistantMapper shared by the module; the mapper holds no state."""
     return HomeAssistantMapper(device_id="test_aquarea", device_name="Test Aquarea")
 
 
-def test_discovery_config_structure(mapper):
-    """Test that discovery config has required Home Assistant fields."""
-    all_fields = STANDARD_FIELDS + EXTRA_FIELDS
-    configs = mapper.message_to_ha_discovery(all_fields)
+@pytest.fixture(scope="module")
+def all_fields():
+    """All standard and extra field specs."""
+    return STANDARD_FIELDS + EXTRA_FIELDS
+
 
-    assert len(configs) == len(all_fields)
+@pytest.fixture(scope="module")
+def discovery_configs(mapper, all_fields):
+    """Discovery configs for all fields, built once for the read-only tests."""
+    return mapper.message_to_ha_discovery(all_fields)
 
-    for topic, config in configs.items():
+
+def test_discovery_config_structure(discovery_configs, all_fields):
+    """Test that discovery config has required Home Assistant fields."""
+    assert len(discovery_configs) == len(all_fields)
+
+    for topic, config in discovery_configs.items():
         assert topic.startswith("homeassistant/sensor/test_aquarea/")
         assert "name" in config
         assert "state_topic" in config
@@ -28,14 +37,13 @@ def test_discovery_config_structure(mapper):
         assert "device" in config
 
 
-def test_discovery_uses_field_metadata(mapper):
+def test_discovery_uses_field_metadata(discovery_configs):
     """Test that discovery config uses FieldSpec metadata."""
-    all_fields = STANDARD_FIELDS + EXTRA_FIELDS
-    configs = mapper.message_to_ha_discovery(all_fields)
-
     # Find temperature field
     temp_field = next(f for f in STANDARD_FIELDS if f.name == "zone1_actual_temp")
-    temp_config = next(c for c in configs.values() if "zone1_actual_temp" in c["unique_id"])
+    temp_config = next(
+        c for c in discovery_configs.values() if "zone1_actual_temp" in c["unique_id"]
+    )
 
     assert temp_config["unit_of_measurement"] == temp_field.unit
     assert temp_config["device_class"] == temp_field.ha_class
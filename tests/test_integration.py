@@ -1,19 +1,24 @@
 # SPDX-License-Identifier: Apache-2.0
 # SPDX-FileCopyrightText: Copyright (c) 2025 Jonas Remmert <j.remmert@mailbox.org>
 
-from pathlib import Path
-from unittest.mock import MagicMock, patch
+import copy
+from typing import Any
+from unittest.mock import MagicMock
 
 import pytest
-import yaml
 
+from hp_ctl.automation import AutomationController
+from hp_ctl.command_manager import CommandManager
 from hp_ctl.main import Application
+from hp_ctl.mqtt import MqttClient
 from hp_ctl.protocol import EXTRA_FIELDS, STANDARD_FIELDS
+from hp_ctl.uart import UartTransceiver
+from tests.fixtures import decoder_test_case_bytes, write_config
 
 
-@pytest.fixture
-def test_config(tmp_path):
-    """Create a temporary config file for testing."""
+@pytest.fixture(scope="module")
+def test_config(tmp_path_factory):
+    """Create a temporary config file for testing (read-only, shared by the module)."""
     config = {
         "uart": {
             "port": "/dev/ttyUSB0",
@@ -24,129 +29,104 @@ def test_config(tmp_path):
             "port": 1883,
         },
     }
-    config_file = tmp_path / "config.yaml"
-    with open(config_file, "w") as f:
-        yaml.dump(config, f)
-    return str(config_file)
+    return write_config(tmp_path_factory.mktemp("integration") / "config.yaml", config)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def panasonic_test_message():
-    """Load panasonic_answer test case from fixtures."""
-    fixture_path = Path(__file__).parent / "fixtures" / "decoder_test_cases.yaml"
-    with open(fixture_path, "r") as f:
-        data = yaml.safe_load(f)
+    """Load panasonic_answer test case from fixtures (immutable bytes, shared)."""
+    return decoder_test_case_bytes("panasonic_answer")
+
+
+@pytest.fixture(scope="module")
+def prototype_app(test_config):
+    """Load the config and build the protocol and mapper once per module."""
+    return Application(config_path=test_config)
+
+
+def _make_app(prototype: Application) -> Application:
+    """Copy the prototype Application and attach mocked MQTT client, UART and command manager.
+
+    The copy is shallow: config, protocol and mapper are shared read-only, while
+    the mocks and state flags set on the copy are its own. The constructor does not
+    open any connections (run() does), so the mocks are assigned directly instead
+    of patching the classes.
+    """
+    app = copy.copy(prototype)
+    app.mqtt_client = MagicMock(spec=MqttClient)
+    app.uart_transceiver = MagicMock(spec=UartTransceiver)
+    app.command_manager = MagicMock(spec=CommandManager)
+    return app
+
+
+def _record_publishes(app: Application) -> dict[str, Any]:
+    """Record the app's MQTT publishes by topic.
+
+    Returns:
+        Dict of {topic: payload}, updated on every publish call with the latest payload.
+    """
+    published: dict[str, Any] = {}
 
-    case_data = data["test_cases"]["panasonic_answer"]
-    raw_hex = case_data["raw_hex"].replace(" ", "").replace("\n", "")
-    return bytes.fromhex(raw_hex)
+    def record(topic: str, payload: Any, *args, **kwargs) -> None:
+        published[topic] = payload
+
+    app.mqtt_client.publish.side_effect = record
+    return published
+
+
+@pytest.fixture
+def app(prototype_app):
+    """Create a fresh Application with its own mocks for each test."""
+    return _make_app(prototype_app)
 
 
 class TestApp:
     """Integration tests for the complete application pipeline."""
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    def test_app_init(self, mock_uart, mock_mqtt, test_config):
+    def test_app_init(self, app):
         """Test that application initializes correctly."""
-        app = Application(config_path=test_config)
-
         assert app.config is not None
         assert app.config["uart"]["port"] == "/dev/ttyUSB0"
         assert app.config["mqtt"]["broker"] == "localhost"
         assert app.ha_mapper is not None
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    def test_uart_decode_publish(
-        self, mock_uart_class, mock_mqtt_class, test_config, panasonic_test_message
-    ):
+    def test_uart_decode_publish(self, app, panasonic_test_message):
         """Test that UART message triggers decode and MQTT publish."""
-        # Setup mocks
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart_class.return_value = MagicMock()
-
-        # Create application
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
+        published = _record_publishes(app)
 
         # Simulate UART message
         app._on_uart_message(panasonic_test_message)
 
         # Verify state updates were published (discovery is now via on_connect callback)
-        assert mock_mqtt.publish.call_count > 0
+        assert len(published) > 0
 
         # Check that state updates were published
-        state_calls = [
-            call for call in mock_mqtt.publish.call_args_list if "aquarea_k/state/" in str(call)
-        ]
-        assert len(state_calls) > 0
-
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    def test_state_after_discovery(
-        self, mock_uart_class, mock_mqtt_class, test_config, panasonic_test_message
-    ):
-        """Test that state updates are published after discovery."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart_class.return_value = MagicMock()
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
-
-        # First message triggers discovery
-        app._on_uart_message(panasonic_test_message)
-        first_call_count = mock_mqtt.publish.call_count
+        assert any(topic.startswith("aquarea_k/state/") for topic in published)
+
+    def test_state_after_discovery(self, app, panasonic_test_message):
+        """Test that UART messages publish only state updates (discovery is on connect)."""
+        published = _record_publishes(app)
 
-        # Second message should only publish state updates (no new discovery)
         app._on_uart_message(panasonic_test_message)
-        second_call_count = mock_mqtt.publish.call_count
 
-        # Second message should have fewer calls (only state updates, no discovery)
-        state_update_calls = second_call_count - first_call_count
-        # Note: state_update_calls will only include fields from the standard packet (0x10)
+        # No discovery configs, only state updates
+        assert all(topic.startswith("aquarea_k/state/") for topic in published)
+        # Note: state updates will only include fields from the standard packet (0x10)
         # since panasonic_test_message is a standard packet, not an extra packet
-        assert state_update_calls <= len(STANDARD_FIELDS)
+        assert app.mqtt_client.publish.call_count <= len(STANDARD_FIELDS)
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    def test_state_correct_values(
-        self, mock_uart_class, mock_mqtt_class, test_config, panasonic_test_message
-    ):
+    def test_state_correct_values(self, app, panasonic_test_message):
         """Test that state updates contain correct decoded values."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart_class.return_value = MagicMock()
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
+        published = _record_publishes(app)
 
         app._on_uart_message(panasonic_test_message)
 
-        # Extract state update calls (those with aquarea_k/state/ in topic)
-        state_calls = [
-            call for call in mock_mqtt.publish.call_args_list if "aquarea_k/state/" in str(call)
-        ]
-
         # Verify specific values from panasonic_answer test case
-        state_dict = {call[0][0]: call[0][1] for call in state_calls}
-
-        assert state_dict["aquarea_k/state/quiet_mode"] == "Off"
-        assert state_dict["aquarea_k/state/zone1_actual_temp"] == "48"
+        assert published["aquarea_k/state/quiet_mode"] == "Off"
+        assert published["aquarea_k/state/zone1_actual_temp"] == "48"
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    def test_invalid_msg_no_crash(self, mock_uart_class, mock_mqtt_class, test_config):
+    def test_invalid_msg_no_crash(self, app):
         """Test that invalid messages are handled gracefully."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart_class.return_value = MagicMock()
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
-
         # Send invalid message (too short)
         invalid_message = b"\x71\x05"
 
@@ -156,40 +136,25 @@ class TestApp:
         # Application should still be functional
         assert app.mqtt_client is not None
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    def test_discovery_on_connect(self, mock_uart_class, mock_mqtt_class, test_config):
+    def test_discovery_on_connect(self, app):
         """Test that discovery configs are published on MQTT connect."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart_class.return_value = MagicMock()
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
-
         # Simulate MQTT on_connect callback (as would happen in real connection)
         app._publish_discovery()
 
-        # Count discovery publishes (homeassistant/sensor/...)
-        discovery_calls = [
-            call for call in mock_mqtt.publish.call_args_list if "homeassistant/sensor" in str(call)
-        ]
+        # Count discovery publish calls (homeassistant/sensor/...), duplicates included
+        discovery_count = sum(
+            1
+            for call in app.mqtt_client.publish.call_args_list
+            if call.args[0].startswith("homeassistant/sensor/")
+        )
 
         # Should have discovery calls for all fields
-        all_fields = STANDARD_FIELDS + EXTRA_FIELDS
-        assert len(discovery_calls) == len(all_fields)
+        assert discovery_count == len(STANDARD_FIELDS) + len(EXTRA_FIELDS)
         assert app.discovery_published
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    def test_discovery_reconnect(self, mock_uart_class, mock_mqtt_class, test_config):
+    def test_discovery_reconnect(self, app):
         """Test that discovery configs are re-published on MQTT reconnect."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart_class.return_value = MagicMock()
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
+        mock_mqtt = app.mqtt_client
 
         # Simulate first connection
         app._publish_discovery()
@@ -205,22 +170,9 @@ class TestApp:
         assert second_call_count == first_call_count * 2
         # Count includes standard fields (sensors) + writable fields
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    @patch("hp_ctl.main.CommandManager")
-    def test_command_handling(self, mock_cm_class, mock_uart_class, mock_mqtt_class, test_config):
+    def test_command_handling(self, app):
         """Test MQTT command handling."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart = MagicMock()
-        mock_uart_class.return_value = mock_uart
-        mock_cm = MagicMock()
-        mock_cm_class.return_value = mock_cm
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
-        app.uart_transceiver = mock_uart
-        app.command_manager = mock_cm
+        mock_cm = app.command_manager
 
         # Test valid command
         topic = "hp_ctl/aquarea_k/set/dhw_target_temp"
@@ -233,27 +185,12 @@ class TestApp:
         # Check standard packet type 0x10 at byte 3
         assert args[3] == 0x10
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    @patch("hp_ctl.main.CommandManager")
-    def test_quiet_mode_allowed_during_automation(
-        self, mock_cm_class, mock_uart_class, mock_mqtt_class, test_config
-    ):
+    def test_quiet_mode_allowed_during_automation(self, app):
         """Test that quiet_mode commands are allowed during automation mode."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart = MagicMock()
-        mock_uart_class.return_value = mock_uart
-        mock_cm = MagicMock()
-        mock_cm_class.return_value = mock_cm
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
-        app.uart_transceiver = mock_uart
-        app.command_manager = mock_cm
+        mock_cm = app.command_manager
 
         # Create mock automation controller with automatic mode enabled
-        mock_automation = MagicMock()
+        mock_automation = MagicMock(spec=AutomationController)
         mock_automation.automatic_mode_enabled = True
         app.automation_controller = mock_automation
 
@@ -267,77 +204,35 @@ class TestApp:
         args = mock_cm.queue_command.call_args[0][0]
         assert args[3] == 0x10  # Standard packet type
 
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    @patch("hp_ctl.main.CommandManager")
-    def test_other_commands_blocked_during_automation(
-        self, mock_cm_class, mock_uart_class, mock_mqtt_class, test_config
-    ):
+    @pytest.mark.parametrize(
+        "topic, payload",
+        [
+            ("hp_ctl/aquarea_k/set/dhw_target_temp", "50"),
+            ("hp_ctl/aquarea_k/set/zone1_heat_target_temp", "40"),
+            ("hp_ctl/aquarea_k/set/hp_status", "On"),
+        ],
+        ids=["dhw_target_temp", "zone1_heat_target_temp", "hp_status"],
+    )
+    def test_other_commands_blocked_during_automation(self, app, topic, payload):
         """Test that non-quiet_mode commands are blocked during automation mode."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart = MagicMock()
-        mock_uart_class.return_value = mock_uart
-        mock_cm = MagicMock()
-        mock_cm_class.return_value = mock_cm
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
-        app.uart_transceiver = mock_uart
-        app.command_manager = mock_cm
+        mock_cm = app.command_manager
 
         # Create mock automation controller with automatic mode enabled
-        mock_automation = MagicMock()
+        mock_automation = MagicMock(spec=AutomationController)
         mock_automation.automatic_mode_enabled = True
         app.automation_controller = mock_automation
 
-        # Test dhw_target_temp command during automation (should be blocked)
-        topic = "hp_ctl/aquarea_k/set/dhw_target_temp"
-        payload = "50"
         app._on_mqtt_command(topic, payload)
 
         # Command should NOT be processed (queue_command not called)
         assert not mock_cm.queue_command.called
 
-        # Test zone1_heat_target_temp command during automation (should be blocked)
-        mock_cm.reset_mock()
-        topic = "hp_ctl/aquarea_k/set/zone1_heat_target_temp"
-        payload = "40"
-        app._on_mqtt_command(topic, payload)
-
-        # Command should NOT be processed
-        assert not mock_cm.queue_command.called
-
-        # Test hp_status command during automation (should be blocked)
-        mock_cm.reset_mock()
-        topic = "hp_ctl/aquarea_k/set/hp_status"
-        payload = "On"
-        app._on_mqtt_command(topic, payload)
-
-        # Command should NOT be processed
-        assert not mock_cm.queue_command.called
-
-    @patch("hp_ctl.main.MqttClient")
-    @patch("hp_ctl.main.UartTransceiver")
-    @patch("hp_ctl.main.CommandManager")
-    def test_all_commands_allowed_when_automation_disabled(
-        self, mock_cm_class, mock_uart_class, mock_mqtt_class, test_config
-    ):
+    def test_all_commands_allowed_when_automation_disabled(self, app):
         """Test that all commands work when automation mode is disabled."""
-        mock_mqtt = MagicMock()
-        mock_mqtt_class.return_value = mock_mqtt
-        mock_uart = MagicMock()
-        mock_uart_class.return_value = mock_uart
-        mock_cm = MagicMock()
-        mock_cm_class.return_value = mock_cm
-
-        app = Application(config_path=test_config)
-        app.mqtt_client = mock_mqtt
-        app.uart_transceiver = mock_uart
-        app.command_manager = mock_cm
+        mock_cm = app.command_manager
 
         # Create mock automation controller with automatic mode disabled
-        mock_automation = MagicMock()
+        mock_automation = MagicMock(spec=AutomationController)
         mock_automation.automatic_mode_enabled = False
         app.automation_controller = mock_automation
 
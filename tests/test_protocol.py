@@ -2,23 +2,22 @@
 # SPDX-FileCopyrightText: Copyright (c) 2025 Jonas Remmert <j.remmert@mailbox.org>
 
 from dataclasses import dataclass
-from pathlib import Path
 
 import pytest
-import yaml
 
-from hp_ctl.protocol import PROTOCOL, Message
+from hp_ctl.protocol import PROTOCOL, HeatPumpProtocol, Message
+from tests.fixtures import load_decoder_test_cases
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MessageTestCase:
     """Test case combining raw message, expected decoded result, and description"""
 
     name: str
-    raw_hex: str
+    raw_bytes: bytes
     expected: Message
     # Track which fields were explicitly specified
-    expected_fields: set[str]
+    expected_fields: frozenset[str]
 
 
 def _load_test_cases() -> dict:
@@ -27,20 +26,12 @@ def _load_test_cases() -> dict:
     Only loads valid message test cases. Invalid message tests (len, checksum)
     are handled by the UART layer and tested in test_uart.py.
     """
-    fixture_path = Path(__file__).parent / "fixtures" / "decoder_test_cases.yaml"
-
-    with open(fixture_path, "r") as f:
-        data = yaml.safe_load(f)
-
     test_cases = {}
-    for case_id, case_data in data["test_cases"].items():
+    for case_id, case_data in load_decoder_test_cases().items():
         # Skip invalid message test cases - those are validated by UART layer
         if "should_raise" in case_data:
             continue
 
-        # Clean up raw_hex by removing whitespace and newlines
-        raw_hex = case_data["raw_hex"].replace(" ", "").replace("\n", "")
-
         # Build expected Message with only specified fields
         expected_dict = case_data.get("expected", {})
 
@@ -60,9 +51,10 @@ def _load_test_cases() -> dict:
 
         test_cases[case_id] = MessageTestCase(
             name=case_id,
-            raw_hex=raw_hex,
+            # fromhex() skips the spaces and newlines of the YAML block
+            raw_bytes=bytes.fromhex(case_data["raw_hex"]),
             expected=expected,
-            expected_fields=set(expected_dict.keys()),
+            expected_fields=frozenset(expected_dict),
         )
 
     return test_cases
@@ -76,7 +68,7 @@ def protocol():
     return PROTOCOL
 
 
-def _validate_message(decoded: Message, expected: Message, expected_fields: set[str]) -> None:
+def _validate_message(decoded: Message, expected: Message, expected_fields: frozenset[str]) -> None:
     """Validate decoded message against expected values.
 
     Only checks fields that were explicitly specified in the test case.
@@ -88,21 +80,18 @@ def _validate_message(decoded: Message, expected: Message, expected_fields: set[
             f"packet_type mismatch: 0x{decoded.packet_type:02x} != 0x{expected.packet_type:02x}"
         )
 
-    # Check decoded fields dict
-    for field_name in expected_fields:
-        if field_name not in ("len", "checksum", "packet_type"):
-            expected_value = expected.fields.get(field_name)
-            decoded_value = decoded.fields.get(field_name)
-            assert decoded_value == expected_value, (
-                f"{field_name} mismatch: {decoded_value} != {expected_value}"
-            )
+    # Check decoded fields dict; expected.fields holds only the specified fields
+    for field_name, expected_value in expected.fields.items():
+        decoded_value = decoded.fields.get(field_name)
+        assert decoded_value == expected_value, (
+            f"{field_name} mismatch: {decoded_value} != {expected_value}"
+        )
 
 
 @pytest.mark.parametrize("test_case", TEST_CASES.values(), ids=lambda tc: tc.name)
 def test_decode_valid_msg(protocol, test_case):
     """Test that decoder can parse a valid UART message."""
-    raw_bytes = bytes.fromhex(test_case.raw_hex)
-    message = protocol.decode(raw_bytes)
+    message = protocol.decode(test_case.raw_bytes)
     assert isinstance(message, Message)
     _validate_message(message, test_case.expected, test_case.expected_fields)
 
@@ -112,3 +101,28 @@ def test_temp_converter():
 
     assert temp_converter(176) == 48
     assert temp_converter(128) == 0
+
+
+def test_decode_no_data_packet(protocol):
+    """Standard packet with the no-data status byte decodes to no fields."""
+    raw_bytes = bytearray(TEST_CASES["panasonic_answer"].raw_bytes)
+    raw_bytes[4] = 0x8A  # no-data marker
+    message = protocol.decode(bytes(raw_bytes))
+    assert message.packet_type == 0x10
+    assert message.fields == {}
+
+
+def test_decode_unknown_status_packet(caplog):
+    """Standard packet with an unknown status byte still decodes the other fields."""
+    protocol = HeatPumpProtocol()
+    raw_bytes = bytearray(TEST_CASES["panasonic_answer"].raw_bytes)
+    raw_bytes[4] = 0x42
+    message = protocol.decode(bytes(raw_bytes))
+    assert "hp_status" not in message.fields
+    assert message.fields
+
+    # Warned once per distinct value, not on every poll
+    protocol.decode(bytes(raw_bytes))
+    warnings = [r for r in caplog.records if r.levelname == "WARNING"]
+    assert len(warnings) == 1
+    assert "Unknown heat pump status 0x42" in warnings[0].getMessage()
@@ -43,36 +43,23 @@ class TestEncode:
         decoded = STANDARD_CODEC.decode(encoded, 0x10)
         assert decoded.fields["zone1_heat_target_temp"] == original_value
 
-    def test_encode_quiet_mode(self):
-        """Quiet mode is correctly encoded to bit field positions"""
-        # Level 2 -> inverse returns 11 (0b01011)
-        # Shifting by 3 bits -> 11 << 3 = 88
-        msg = Message(packet_type=0x10, fields={"quiet_mode": "Level 2"})
-
-        encoded = STANDARD_CODEC.encode(msg)
-        assert encoded[7] == 88
-
-    def test_hp_status_encode(self):
-        """HP status (On/Off) is correctly encoded"""
-        msg_on = Message(packet_type=0x10, fields={"hp_status": "On"})
-        encoded_on = STANDARD_CODEC.encode(msg_on)
-        assert encoded_on[4] == 2
-
-        msg_off = Message(packet_type=0x10, fields={"hp_status": "Off"})
-        encoded_off = STANDARD_CODEC.encode(msg_off)
-        assert encoded_off[4] == 1
-
-    def test_operating_mode_encode(self):
-        """Operating mode is correctly encoded"""
-        msg = Message(packet_type=0x10, fields={"operating_mode": "Heat"})
-        encoded = STANDARD_CODEC.encode(msg)
-        assert encoded[6] == 0x52  # Z1 On, DHW Off, Mode Heat
-
-    def test_operating_mode_encode_heat_dhw(self):
-        """Operating mode Heat+DHW is correctly encoded"""
-        msg = Message(packet_type=0x10, fields={"operating_mode": "Heat+DHW"})
-        encoded = STANDARD_CODEC.encode(msg)
-        assert encoded[6] == 0x62  # Z1 On, DHW On, Mode Heat
+    @pytest.mark.parametrize(
+        ("field", "value", "byte_index", "expected"),
+        [
+            # Level 2 -> inverse returns 11 (0b01011), shifted by 3 bits -> 88
+            pytest.param("quiet_mode", "Level 2", 7, 88, id="quiet_mode_level2"),
+            pytest.param("hp_status", "On", 4, 2, id="hp_status_on"),
+            pytest.param("hp_status", "Off", 4, 1, id="hp_status_off"),
+            # Z1 On, DHW Off, Mode Heat
+            pytest.param("operating_mode", "Heat", 6, 0x52, id="operating_mode_heat"),
+            # Z1 On, DHW On, Mode Heat
+            pytest.param("operating_mode", "Heat+DHW", 6, 0x62, id="operating_mode_heat_dhw"),
+        ],
+    )
+    def test_encode_field_byte(self, field, value, byte_index, expected):
+        """Option fields are encoded to the expected byte value"""
+        encoded = STANDARD_CODEC.encode(Message(packet_type=0x10, fields={field: value}))
+        assert encoded[byte_index] == expected
 
     def test_validation_ranges(self):
         """Values outside valid range raise ValueError"""
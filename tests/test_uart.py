@@ -1,47 +1,58 @@
 # SPDX-License-Identifier: Apache-2.0
 # SPDX-FileCopyrightText: Copyright (c) 2025 Jonas Remmert <j.remmert@mailbox.org>
 
+import io
+import threading
 import time
-from pathlib import Path
 from unittest.mock import MagicMock
 
-import yaml
+import pytest
+import serial
 
-from hp_ctl.uart import UartTransceiver
+from hp_ctl.uart import UartTransceiver, extract_frame
+from tests.fixtures import decoder_test_case_bytes as load_test_case
 
 
-def load_test_case(name: str) -> bytes:
-    """Load raw hex from decoder test cases."""
-    fixture_path = Path(__file__).parent / "fixtures" / "decoder_test_cases.yaml"
-    with open(fixture_path, "r") as f:
-        data = yaml.safe_load(f)
-    raw_hex = data["test_cases"][name]["raw_hex"].replace(" ", "").replace("\n", "")
-    return bytes.fromhex(raw_hex)
+def _mock_blocking_serial(read) -> MagicMock:
+    """Create a mock serial port whose read() blocks like a real port once drained.
+
+    Args:
+        read: Callable returning the next bytes for read(n), b"" once exhausted.
+
+    Returns:
+        Mock serial port. Once read() is drained, it waits up to the 1 s port
+        timeout, and cancel_read() (called by close()) wakes it immediately.
+    """
+    cancelled = threading.Event()
+
+    def blocking_read(size: int) -> bytes:
+        data = read(size)
+        if not data:
+            cancelled.wait(timeout=1.0)
+        return data
+
+    mock_serial = MagicMock(spec=serial.Serial)
+    mock_serial.read.side_effect = blocking_read
+    mock_serial.cancel_read.side_effect = cancelled.set
+    return mock_serial
 
 
 def test_uart_receiver_callback(mocker):
     """Test that UART receiver calls callback with mocked raw bytes."""
     test_message = load_test_case("panasonic_answer")
 
-    mock_serial = MagicMock()
-    # Make read() return bytes sequentially from the test message
-    # Each call to read(n) returns the next n bytes
-    read_position = [0]  # Use list to allow modification in nested function
-
-    def mock_read(n):
-        start = read_position[0]
-        end = start + n
-        result = test_message[start:end]
-        read_position[0] = end
-        return result
-
-    mock_serial.read.side_effect = mock_read
+    # Each call to read(n) returns the next n bytes of the test message, then
+    # blocks until the port timeout or close() once exhausted
+    mock_serial = _mock_blocking_serial(io.BytesIO(test_message).read)
+    mock_serial.in_waiting = 0
     mocker.patch("serial.Serial", return_value=mock_serial)
 
     callback_called = []
+    received = threading.Event()
 
     def mock_callback(message: bytes):
         callback_called.append(message)
+        received.set()
 
     # Thread starts automatically in __init__ with poll_interval
     receiver = UartTransceiver(
@@ -51,7 +62,7 @@ def test_uart_receiver_callback(mocker):
         poll_interval=0.1,
     )
     try:
-        time.sleep(0.2)  # Allow loop to trigger
+        assert received.wait(timeout=1.0)
     finally:
         receiver.close()
 
@@ -60,69 +71,164 @@ def test_uart_receiver_callback(mocker):
     assert callback_called[0] == test_message
 
 
-def test_uart_validate_length(mocker):
-    """Test that UART receiver validates message length correctly."""
-    mock_serial = MagicMock()
-    # Return empty bytes so thread doesn't block
-    mock_serial.read.return_value = b""
+def test_uart_receiver_buffered_frames(mocker):
+    """Test that frames arriving in one read with leading garbage are all emitted."""
+    test_message = load_test_case("panasonic_answer")
+    chunks = [b"\x00\xff" + test_message + test_message]
+
+    mock_serial = _mock_blocking_serial(lambda n: chunks.pop(0) if chunks else b"")
+    mock_serial.in_waiting = len(chunks[0])
+    mocker.patch("serial.Serial", return_value=mock_serial)
+
+    callback_called = []
+    both_received = threading.Event()
+
+    def mock_callback(message: bytes):
+        callback_called.append(message)
+        if len(callback_called) == 2:
+            both_received.set()
+
+    receiver = UartTransceiver(port="/dev/ttyUSB0", on_message=mock_callback)
+    try:
+        assert both_received.wait(timeout=1.0)
+    finally:
+        receiver.close()
+
+    assert callback_called == [test_message, test_message]
+
+
+def test_uart_receive_without_listener(mocker):
+    """Test reading frames synchronously when no listener thread is started."""
+    test_message = load_test_case("panasonic_answer")
+    chunks = [test_message + b"\x00"]
+
+    mock_serial = MagicMock(spec=serial.Serial)
+    mock_serial.read.side_effect = lambda n: chunks.pop(0) if chunks else b""
+    mock_serial.in_waiting = len(chunks[0])
+    mocker.patch("serial.Serial", return_value=mock_serial)
+
+    transceiver = UartTransceiver(port="/dev/ttyUSB0", start_listener=False)
+    assert transceiver.thread is None
+
+    assert transceiver.receive_and_validate() == test_message
+    assert transceiver.receive_and_validate() is None
+
+    transceiver.close()
+
+
+def test_uart_close_interrupts_error_backoff(mocker):
+    """Test that close() does not wait out the back-off after a read error."""
+    read_failed = threading.Event()
+
+    def failing_read(size: int) -> bytes:
+        read_failed.set()
+        raise OSError("device disconnected")
+
+    mock_serial = MagicMock(spec=serial.Serial)
+    mock_serial.read.side_effect = failing_read
+    mock_serial.in_waiting = 0
     mocker.patch("serial.Serial", return_value=mock_serial)
 
-    receiver = UartTransceiver(port="/dev/ttyUSB0", baudrate=9600)
+    receiver = UartTransceiver(port="/dev/ttyUSB0", poll_interval=30.0)
+    assert read_failed.wait(timeout=1.0)  # The loop is now backing off
+
+    start = time.monotonic()
+    receiver.close()
+
+    assert time.monotonic() - start < 1.0
+    assert not receiver.thread.is_alive()
+
+
+def test_extract_frame():
+    """Test frame extraction from a receive buffer without serial I/O."""
+    test_message = load_test_case("panasonic_answer")
+    rx_buf = bytearray(b"\x00" + test_message[:10])
+
+    # Incomplete frame stays buffered, leading garbage is dropped
+    assert extract_frame(rx_buf) is None
+    assert rx_buf == test_message[:10]
 
+    rx_buf += test_message[10:] + b"\x71"
+    assert extract_frame(rx_buf) == test_message
+    assert rx_buf == b"\x71"
+
+    # No delimiter at all clears the buffer
+    rx_buf[:] = b"\x01\x02"
+    assert extract_frame(rx_buf) is None
+    assert rx_buf == b""
+
+
+def test_uart_validate_length():
+    """Test that UART receiver validates message length correctly."""
     # Valid messages
     valid_msg = load_test_case("panasonic_answer")
-    assert receiver.validate_length(valid_msg) is True
+    assert UartTransceiver.validate_length(valid_msg) is True
 
     # Too short
     too_short = b"\x71\xc8"
-    assert receiver.validate_length(too_short) is False
+    assert UartTransceiver.validate_length(too_short) is False
 
     # Length mismatch
     length_mismatch = load_test_case("invalid_message_length_mismatch")
-    assert receiver.validate_length(length_mismatch) is False
-
-    receiver.close()
+    assert UartTransceiver.validate_length(length_mismatch) is False
 
 
-def test_uart_validate_crc(mocker):
+def test_uart_validate_crc():
     """Test that UART receiver validates checksum correctly."""
-    mock_serial = MagicMock()
-    # Return empty bytes so thread doesn't block
-    mock_serial.read.return_value = b""
-    mocker.patch("serial.Serial", return_value=mock_serial)
-
-    receiver = UartTransceiver(port="/dev/ttyUSB0", baudrate=9600)
-
     # Valid messages
     valid_msg = load_test_case("panasonic_answer")
-    assert receiver.validate_crc(valid_msg) is True
+    assert UartTransceiver.validate_crc(valid_msg) is True
 
     # Invalid checksum
     invalid_checksum = load_test_case("invalid_checksum")
-    assert receiver.validate_crc(invalid_checksum) is False
-
-    receiver.close()
-
-
-def test_uart_send(mocker):
+    assert UartTransceiver.validate_crc(invalid_checksum) is False
+
+
+@pytest.mark.parametrize(
+    ("data", "checksum"),
+    [
+        # Start(0xF1) + Type(0x10) + Data(0x01): sum 258, -258 & 0xFF = 0xFE
+        (bytes([0xF1, 0x10, 0x01]), 0xFE),
+        # Query frame: sum 238, -238 & 0xFF = 0x12
+        (b"\x71\x6c\x01\x10" + bytes(106), 0x12),
+        # Header sum 366 + 106 * 0xFF = 27396, -27396 & 0xFF = 0xFC
+        (b"\xf1\x6c\x01\x10" + b"\xff" * 106, 0xFC),
+    ],
+    ids=["short", "query", "all_ones"],
+)
+def test_uart_send(mocker, data, checksum):
     """Test UART sending with checksum calculation."""
-    mock_serial = MagicMock()
+    mock_serial = MagicMock(spec=serial.Serial)
     mocker.patch("serial.Serial", return_value=mock_serial)
 
-    transceiver = UartTransceiver(port="/dev/ttyUSB0")
-
-    # Data to send (without checksum)
-    # Start(0xF1) + Type(0x10) + Data(0x01)
-    data = bytes([0xF1, 0x10, 0x01])
-    # Checksum: (0 - (0xF1+0x10+0x01)) & 0xFF
-    # 0xF1=241, 0x10=16, 0x01=1. Sum=258.
-    # 258 & 0xFF = 2.
-    # 0 - 2 = -2. -2 & 0xFF = 254 (0xFE).
-    expected_checksum = 0xFE
-    expected_msg = data + bytes([expected_checksum])
+    transceiver = UartTransceiver(port="/dev/ttyUSB0", start_listener=False)
+    expected_msg = data + bytes([checksum])
 
     transceiver.send(data)
 
     mock_serial.write.assert_called_once_with(expected_msg)
+    # The checksum makes the sum of all frame bytes 0 modulo 256
+    assert sum(expected_msg) & 0xFF == 0
 
     transceiver.close()
+
+
+def test_uart_low_latency_mode(mocker):
+    """Test that low-latency mode is requested from pyserial on open."""
+    mock_serial = MagicMock(spec=serial.Serial)
+    mocker.patch("serial.Serial", return_value=mock_serial)
+
+    UartTransceiver(port="/dev/ttyUSB0", start_listener=False)
+
+    mock_serial.set_low_latency_mode.assert_called_once_with(True)
+
+
+def test_uart_low_latency_mode_unsupported(mocker):
+    """Test that an unsupported low-latency mode does not prevent opening the port."""
+    mock_serial = MagicMock(spec=serial.Serial)
+    mock_serial.set_low_latency_mode.side_effect = ValueError("not a tty")
+    mocker.patch("serial.Serial", return_value=mock_serial)
+
+    transceiver = UartTransceiver(port="/dev/ttyUSB0", start_listener=False)
+
+    assert transceiver.serial_conn is mock_serial